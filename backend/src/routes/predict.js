@@ -1,5 +1,5 @@
 import express from "express";
-import { fetchBusinessImpactPrediction } from "../services/mlService.js";
+import { fetchBusinessImpactPrediction, fetchBusinessImpactPredictions } from "../services/mlService.js";
 import { parseBusinessQuery } from "../utils/queryParser.js";
 import { LOCATION_PROFILES } from "../utils/locationProfiles.js";
 import { generateAiExplanation } from "../services/aiExplainer.js";
@@ -30,4 +30,31 @@ router.post("/", async (req, res) => {
   }
 });
 
+router.post("/batch", async (req, res) => {
+  try {
+    const { items } = req.body || {};
+    if (!Array.isArray(items) || items.length === 0) {
+      return res.status(400).json({ error: "items must be a non-empty array" });
+    }
+
+    const inputs = items.map(({ query = "", businessType, scale, location } = {}) =>
+      parseBusinessQuery({ query, businessType, scale, location })
+    );
+    const predictions = await fetchBusinessImpactPredictions(inputs);
+    const generatedAt = new Date().toISOString();
+
+    res.json({
+      results: predictions.map((prediction, index) => ({
+        input: inputs[index],
+        prediction,
+        summary: generateAiExplanation({ prediction, input: inputs[index], query: inputs[index].query || "" }),
+        generatedAt,
+      })),
+    });
+  } catch (error) {
+    const statusCode = error.status || 400;
+    res.status(statusCode).json({ error: error.message || "Unable to process request" });
+  }
+});
+
 export default router;
@@ -0,0 +1 @@
+"""Timing and peak-memory benchmarks for the data, training and serving hot paths."""
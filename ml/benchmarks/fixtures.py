@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+from ml import config
+
+# Replicas are scattered around the original point so density stays local instead of smearing across the region.
+JITTER_DEG = 0.003
+# Added to OSM ids per replica so merged frames do not dedupe the copies away.
+ID_STRIDE = 10**11
+FIXTURE_MANIFEST = "fixture.json"
+
+
+def scaled_dataset_dir(scale: int, fixtures_root: Path, seed: int = 0) -> Path:
+    """Directory holding the bundled datasets scaled ``scale`` times.
+
+    Scale 1 is ``config.DATASET_DIR`` itself. Larger
+    scales are generated once under ``fixtures_root`` and reused on later
+    runs: every Overpass node or way and every GTFS stop is copied
+    ``scale`` times with a jittered position and a fresh id. ACS tracts are
+    copied unchanged since their count is fixed by geography.
+    """
+    if scale <= 1:
+        return config.DATASET_DIR
+    target = Path(fixtures_root) / f"scale-{scale}-seed-{seed}"
+    if (target / FIXTURE_MANIFEST).exists():
+        return target
+    staging = target.with_name(f".{target.name}.staging")
+    shutil.rmtree(staging, ignore_errors=True)
+    (staging / "google_transit").mkdir(parents=True)
+    rng = np.random.default_rng(seed)
+
+    written: Dict[str, str] = {}
+    for region in config.REGIONAL_DATASETS:
+        for filename in (region.business_file, region.existing_business_file, region.roads_file):
+            if filename and filename not in written:
+                _scale_overpass(config.DATASET_DIR / filename, staging / filename, scale, rng)
+                written[filename] = "overpass"
+        if region.acs_file and region.acs_file not in written:
+            shutil.copyfile(config.DATASET_DIR / region.acs_file, staging / region.acs_file)
+            written[region.acs_file] = "copy"
+    _scale_stops(
+        config.DATASET_DIR / "google_transit" / "stops.txt", staging / "google_transit" / "stops.txt", scale, rng
+    )
+
+    with (staging / FIXTURE_MANIFEST).open("w", encoding="utf-8") as fh:
+        json.dump({"scale": scale, "seed": seed, "files": written}, fh, indent=2)
+    shutil.rmtree(target, ignore_errors=True)
+    staging.rename(target)
+    return target
+
+
+def _scale_overpass(source: Path, target: Path, scale: int, rng: np.random.Generator) -> None:
+    with source.open("r", encoding="utf-8") as fh:
+        payload = json.load(fh)
+    elements = payload.pop("elements", [])
+    # Elements are streamed out one at a time so 100x road extracts never sit in memory as one document.
+    with target.open("w", encoding="utf-8") as fh:
+        header = json.dumps(payload)
+        fh.write(header[:-1] + (", " if payload else "") + '"elements": [')
+        first = True
+        for element in _replicate_elements(elements, scale, rng):
+            fh.write(("" if first else ",\n") + json.dumps(element))
+            first = False
+        fh.write("]}")
+
+
+def _replicate_elements(elements: list, scale: int, rng: np.random.Generator) -> Iterable[dict]:
+    for replica in range(scale):
+        offsets = rng.normal(0, JITTER_DEG, size=(len(elements), 2)) if replica else np.zeros((len(elements), 2))
+        for element, (d_lat, d_lon) in zip(elements, offsets):
+            if not replica:
+                yield element
+                continue
+            copy = dict(element)
+            copy["id"] = int(element.get("id", 0)) + replica * ID_STRIDE
+            if "lat" in element and "lon" in element:
+                copy["lat"] = element["lat"] + d_lat
+                copy["lon"] = element["lon"] + d_lon
+            if element.get("geometry"):
+                copy["geometry"] = [
+                    {"lat": point["lat"] + d_lat, "lon": point["lon"] + d_lon} for point in element["geometry"]
+                ]
+            yield copy
+
+
+def _scale_stops(source: Path, target: Path, scale: int, rng: np.random.Generator) -> None:
+    stops = pd.read_csv(source, dtype={"stop_id": str, "stop_code": str})
+    replicas = [stops]
+    for replica in range(1, scale):
+        copy = stops.copy()
+        offsets = rng.normal(0, JITTER_DEG, size=(len(stops), 2))
+        copy["stop_id"] = copy["stop_id"].astype(str) + f"-{replica}"
+        copy["stop_lat"] = copy["stop_lat"] + offsets[:, 0]
+        copy["stop_lon"] = copy["stop_lon"] + offsets[:, 1]
+        replicas.append(copy)
+    pd.concat(replicas, ignore_index=True).to_csv(target, index=False)
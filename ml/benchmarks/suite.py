@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import gc
+import json
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+from ml import config
+from ml.benchmarks.fixtures import scaled_dataset_dir
+from ml.data_loader import DatasetLoader
+from ml.feature_engineering import FeatureEngineer, LocationFeatureRepository
+from ml.model_trainer import ModelTrainer
+from ml.prediction_service.predictor import PredictionPipeline
+
+BENCHMARK_DIR = config.BASE_DIR / "benchmarks"
+DEFAULT_BASELINE_PATH = BENCHMARK_DIR / "baseline.json"
+DEFAULT_FIXTURES_ROOT = config.CACHE_DIR / "benchmark_fixtures"
+DEFAULT_SCALES = (1, 10, 100)
+DEFAULT_TOLERANCE = 0.25
+FEATURE_VECTOR_ROUNDS = 100
+PREDICT_CALLS = 50
+PREDICT_BATCH_SIZE = 256
+
+
+@dataclass
+class BenchmarkContext:
+    """State shared by the benchmarks of one dataset scale."""
+
+    scale: int
+    loader: DatasetLoader
+    repository: LocationFeatureRepository
+    engineer: FeatureEngineer
+    work_dir: Path
+    models_dir: Path | None = None
+    pipelines: Dict[str, PredictionPipeline] = field(default_factory=dict)
+
+
+@dataclass
+class Benchmark:
+    name: str
+    run: Callable[[BenchmarkContext], Any]
+    repeat: int = 3
+    needs_model: bool = False
+
+
+def _load_datasets(ctx: BenchmarkContext) -> None:
+    # A fresh loader without the columnar cache measures raw parsing of every regional file.
+    loader = DatasetLoader(dataset_dir=ctx.loader.dataset_dir, columnar_cache_dir=None, regions=ctx.loader.regions)
+    loader.business_df, loader.existing_business_df, loader.transit_df, loader.road_segments, loader.acs_df
+
+
+def _summarize_roads(ctx: BenchmarkContext) -> None:
+    ctx.repository._summarize_roads()
+
+
+def _count_businesses(ctx: BenchmarkContext) -> None:
+    ctx.repository._count_businesses_by_profile(ctx.loader.business_df, config.LOCATION_PROFILES)
+
+
+def _build_feature_vector(ctx: BenchmarkContext) -> None:
+    for _ in range(FEATURE_VECTOR_ROUNDS):
+        for profile in config.LOCATION_PROFILES:
+            for business_type in config.BUSINESS_TYPE_INFO:
+                for scale in config.SCALE_FACTORS:
+                    ctx.engineer.build_feature_vector(profile.key, business_type, scale)
+
+
+def _generate_training_frame(ctx: BenchmarkContext) -> None:
+    ctx.engineer.generate_training_frame()
+
+
+def _model_trainer_run(ctx: BenchmarkContext) -> None:
+    models_dir = ctx.work_dir / "models"
+    ModelTrainer(
+        output_dir=models_dir,
+        loader=ctx.loader,
+        dataset_output=ctx.work_dir / "training_data",
+        metrics_cache_path=ctx.work_dir / "location_metrics.json",
+    ).run()
+    ctx.models_dir = models_dir
+
+
+def _prediction_payloads(count: int) -> List[Dict[str, str]]:
+    combos = [
+        {"location_key": profile.key, "business_type": business_type, "scale": scale}
+        for profile in config.LOCATION_PROFILES
+        for business_type in config.BUSINESS_TYPE_INFO
+        for scale in config.SCALE_FACTORS
+    ]
+    return [combos[idx % len(combos)] for idx in range(count)]
+
+
+def _predict(source: str) -> Callable[[BenchmarkContext], None]:
+    def run(ctx: BenchmarkContext) -> None:
+        pipeline = _pipeline(ctx, source)
+        for payload in _prediction_payloads(PREDICT_CALLS):
+            pipeline.predict(payload)
+
+    return run
+
+
+def _predict_many(source: str) -> Callable[[BenchmarkContext], None]:
+    def run(ctx: BenchmarkContext) -> None:
+        _pipeline(ctx, source).predict_many(_prediction_payloads(PREDICT_BATCH_SIZE))
+
+    return run
+
+
+def _pipeline(ctx: BenchmarkContext, source: str) -> PredictionPipeline:
+    """Pipeline over the model trained at this scale, built once per source.
+
+    ``artifacts`` serves the pickled sklearn forest and ``bundle`` the
+    compiled forest from ``serving_bundle.npz``, the two production setups.
+    """
+    if ctx.models_dir is None:
+        raise RuntimeError("model_trainer_run must run before the prediction benchmarks")
+    if source not in ctx.pipelines:
+        ctx.pipelines[source] = PredictionPipeline(
+            models_dir=ctx.models_dir,
+            source=source,
+            loader=ctx.loader,
+            metrics_cache_path=ctx.work_dir / "location_metrics.json",
+        )
+    return ctx.pipelines[source]
+
+
+BENCHMARKS: Sequence[Benchmark] = (
+    Benchmark("load_datasets", _load_datasets, repeat=1),
+    Benchmark("summarize_roads", _summarize_roads),
+    Benchmark("count_businesses", _count_businesses),
+    Benchmark("build_feature_vector", _build_feature_vector),
+    Benchmark("generate_training_frame", _generate_training_frame),
+    Benchmark("model_trainer_run", _model_trainer_run, repeat=1),
+    Benchmark("predict[artifacts]", _predict("artifacts"), needs_model=True),
+    Benchmark("predict[bundle]", _predict("bundle"), needs_model=True),
+    Benchmark("predict_many[artifacts]", _predict_many("artifacts"), needs_model=True),
+    Benchmark("predict_many[bundle]", _predict_many("bundle"), needs_model=True),
+)
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Wall time over ``repeat`` runs, then one traced run for peak Python/NumPy allocations.
+
+    ``tracemalloc`` sees only this process, so work done in the loader's
+    process pool counts towards time but not towards ``peak_mb``.
+    """
+    timings: List[float] = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "seconds_min": min(timings),
+        "seconds_median": statistics.median(timings),
+        "peak_mb": peak / 1e6,
+        "repeat": repeat,
+    }
+
+
+def run_suite(
+    scales: Sequence[int] = DEFAULT_SCALES,
+    only: Sequence[str] | None = None,
+    fixtures_root: Path = DEFAULT_FIXTURES_ROOT,
+    log: Callable[[str], None] = print,
+) -> Dict[str, Any]:
+    """Run every benchmark (or those named in ``only``) at each dataset scale."""
+    selected = [benchmark for benchmark in BENCHMARKS if not only or benchmark.name in only]
+    if any(benchmark.needs_model for benchmark in selected):
+        # Prediction benchmarks serve the model trained at the same scale.
+        selected = [
+            benchmark for benchmark in BENCHMARKS if benchmark in selected or benchmark.run is _model_trainer_run
+        ]
+    results: Dict[str, Dict[str, float]] = {}
+    for scale in scales:
+        dataset_dir = scaled_dataset_dir(scale, fixtures_root)
+        with tempfile.TemporaryDirectory(prefix=f"bench-{scale}x-") as work:
+            work_dir = Path(work)
+            loader = DatasetLoader(
+                dataset_dir=dataset_dir, columnar_cache_dir=work_dir / "columnar", regions=config.REGIONAL_DATASETS
+            )
+            repository = LocationFeatureRepository(loader, cache_path=work_dir / "location_metrics.json")
+            ctx = BenchmarkContext(scale, loader, repository, FeatureEngineer(repository), work_dir)
+            for benchmark in selected:
+                key = f"{benchmark.name}@{scale}x"
+                results[key] = measure(lambda: benchmark.run(ctx), benchmark.repeat)
+                log(_format_row(key, results[key]))
+    return {"meta": _environment(), "results": results}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """Return one line per benchmark; regressions beyond ``tolerance`` are marked ``REGRESSION``."""
+    lines: List[str] = []
+    for key, stats in current["results"].items():
+        reference = baseline.get("results", {}).get(key)
+        if reference is None:
+            lines.append(f"{key:<40} new")
+            continue
+        time_ratio = stats["seconds_min"] / max(reference["seconds_min"], 1e-9)
+        memory_ratio = stats["peak_mb"] / max(reference["peak_mb"], 1e-9)
+        regressed = time_ratio > 1 + tolerance or memory_ratio > 1 + tolerance
+        flag = "REGRESSION" if regressed else "ok"
+        lines.append(f"{key:<40} time x{time_ratio:5.2f}  peak x{memory_ratio:5.2f}  {flag}")
+    return lines
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    with Path(path).open("r", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def save_results(results: Dict[str, Any], path: Path) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as fh:
+        json.dump(results, fh, indent=2, sort_keys=True)
+
+
+def _format_row(key: str, stats: Dict[str, float]) -> str:
+    return (
+        f"{key:<40} min {stats['seconds_min'] * 1000:10.1f} ms  "
+        f"median {stats['seconds_median'] * 1000:10.1f} ms  peak {stats['peak_mb']:8.1f} MB"
+    )
+
+
+def _environment() -> Dict[str, str]:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+    }
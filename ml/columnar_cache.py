@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import errno
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+from ml.utils.hashing import file_fingerprint
+
+MANIFEST_FILENAME = "manifest.json"
+
+
+class ColumnarCache:
+    """Stores parsed dataset columns as memory-mappable ``.npy`` files.
+
+    Each source file gets a directory named after its path and content
+    fingerprint, so editing the source invalidates the entry automatically.
+    String columns are dictionary-encoded into int32 codes plus a category
+    table and come back as pandas categoricals.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+
+    def load_frame(self, source: Path, build: Callable[[], pd.DataFrame], schema: str = "") -> pd.DataFrame:
+        columns = self.load_arrays(source, lambda: self._encode_frame(build()), schema=schema)
+        return self._decode_frame(columns)
+
+    def load_arrays(
+        self, source: Path, build: Callable[[], Dict[str, np.ndarray]], schema: str = ""
+    ) -> Dict[str, np.ndarray]:
+        """Return cached columns for ``source``, building them first if needed.
+
+        ``schema`` names the shape ``build`` produces; change it whenever the
+        parser changes so entries written by older code are not reused.
+        """
+        entry = self._entry_dir(source, schema)
+        if not (entry / MANIFEST_FILENAME).exists():
+            self._write_entry(source, entry, build(), schema)
+        return self._read_entry(entry)
+
+    def _entry_prefix(self, source: Path, schema: str) -> str:
+        key = f"{Path(source).resolve()}|{schema}"
+        path_hash = hashlib.sha1(key.encode("utf-8")).hexdigest()[:8]
+        return f"{Path(source).name}-{path_hash}"
+
+    def _entry_dir(self, source: Path, schema: str) -> Path:
+        return self.cache_dir / f"{self._entry_prefix(source, schema)}-{file_fingerprint(source)[:16]}"
+
+    def _write_entry(self, source: Path, entry: Path, columns: Dict[str, np.ndarray], schema: str) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(dir=self.cache_dir, prefix=".staging-"))
+        try:
+            for name, values in columns.items():
+                np.save(staging / f"{name}.npy", np.asarray(values), allow_pickle=False)
+            with (staging / MANIFEST_FILENAME).open("w", encoding="utf-8") as fh:
+                json.dump({"source": str(source), "schema": schema, "columns": list(columns)}, fh, indent=2)
+            if (entry / MANIFEST_FILENAME).exists():
+                # Another process built the same entry meanwhile; its columns are the same, keep them.
+                return
+            for stale in self.cache_dir.glob(f"{self._entry_prefix(source, schema)}-*"):
+                if stale.name != entry.name:
+                    shutil.rmtree(stale, ignore_errors=True)
+            try:
+                os.replace(staging, entry)
+            except OSError as exc:
+                # A concurrent builder renamed its staging directory into place first.
+                if exc.errno not in (errno.ENOTEMPTY, errno.EEXIST):
+                    raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _read_entry(self, entry: Path) -> Dict[str, np.ndarray]:
+        with (entry / MANIFEST_FILENAME).open("r", encoding="utf-8") as fh:
+            manifest = json.load(fh)
+        return {name: np.load(entry / f"{name}.npy", mmap_mode="r") for name in manifest["columns"]}
+
+    @staticmethod
+    def _encode_frame(frame: pd.DataFrame) -> Dict[str, np.ndarray]:
+        columns: Dict[str, np.ndarray] = {}
+        for name in frame.columns:
+            series = frame[name]
+            if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                columns[name] = series.to_numpy()
+                continue
+            codes, categories = pd.factorize(series.astype(object).where(series.notna(), None))
+            columns[f"{name}.codes"] = codes.astype(np.int32)
+            columns[f"{name}.categories"] = np.asarray([str(value) for value in categories], dtype=str)
+        return columns
+
+    @staticmethod
+    def _decode_frame(columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+        data: Dict[str, object] = {}
+        for key, values in columns.items():
+            if key.endswith(".categories"):
+                continue
+            if key.endswith(".codes"):
+                name = key[: -len(".codes")]
+                categories = columns[f"{name}.categories"]
+                data[name] = pd.Categorical.from_codes(np.asarray(values), categories=categories.tolist())
+            else:
+                data[key] = values
+        return pd.DataFrame(data)
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Mapping
+
+import numpy as np
+
+from ml.utils.npz import load_npz, save_npz_atomic
+
+COMPILED_MODEL_FILENAME = "business_impact_model.forest.npz"
+# Rows traversed together. The (trees x rows) node and leaf-value temporaries grow with the
+# block, and past a few hundred rows they fall out of cache and each row gets slower.
+PREDICT_BLOCK_ROWS = 128
+
+
+@dataclass
+class CompiledForest:
+    """Random forest flattened into contiguous node arrays for fast inference.
+
+    Every tree of every output forest lives in the same ``feature`` /
+    ``threshold`` / ``left`` / ``right`` / ``value`` arrays. Leaves point back
+    at themselves with an infinite threshold, so traversal is a fixed number
+    of gather steps over all trees and rows at once.
+
+    A joint forest's ``value`` holds every target per node, shaped
+    (n_nodes, n_targets). Per-target forests predict one target per tree,
+    so ``value`` holds one entry per node; their trees are stored target by
+    target, ``trees_per_target`` of each, which is the per-tree target index.
+    """
+
+    feature: np.ndarray
+    threshold: np.ndarray
+    left: np.ndarray
+    right: np.ndarray
+    value: np.ndarray
+    roots: np.ndarray
+    trees_per_target: np.ndarray
+    max_depth: int
+    n_features: int
+
+    @property
+    def n_trees(self) -> int:
+        return int(self.roots.shape[0])
+
+    @property
+    def n_targets(self) -> int:
+        return int(self.trees_per_target.shape[0])
+
+    @property
+    def per_target(self) -> bool:
+        return self.value.ndim == 1
+
+    @classmethod
+    def from_estimator(cls, estimator) -> "CompiledForest":
+        """Compile a fitted forest or a ``MultiOutputRegressor`` of forests."""
+        if hasattr(estimator, "estimators_") and not hasattr(estimator, "n_outputs_"):
+            forests = list(estimator.estimators_)
+            n_targets = len(forests)
+            per_forest_targets = [[idx] for idx in range(n_targets)]
+        else:
+            forests = [estimator]
+            n_targets = int(estimator.n_outputs_)
+            per_forest_targets = [list(range(n_targets))]
+
+        features: List[np.ndarray] = []
+        thresholds: List[np.ndarray] = []
+        lefts: List[np.ndarray] = []
+        rights: List[np.ndarray] = []
+        values: List[np.ndarray] = []
+        roots: List[int] = []
+        trees_per_target = np.zeros(n_targets, dtype=np.int64)
+        max_depth = 0
+        offset = 0
+
+        for forest, target_idx in zip(forests, per_forest_targets):
+            for tree_estimator in forest.estimators_:
+                tree = tree_estimator.tree_
+                n_nodes = tree.node_count
+                node_ids = np.arange(n_nodes, dtype=np.int32)
+                is_leaf = tree.children_left == -1
+
+                features.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+                thresholds.append(np.where(is_leaf, np.inf, tree.threshold).astype(np.float64))
+                lefts.append(np.where(is_leaf, node_ids, tree.children_left).astype(np.int32) + offset)
+                rights.append(np.where(is_leaf, node_ids, tree.children_right).astype(np.int32) + offset)
+
+                if len(forests) > 1:
+                    values.append(tree.value[:, 0, 0].astype(np.float64))
+                else:
+                    values.append(tree.value[:, :, 0].astype(np.float64))
+
+                roots.append(offset)
+                trees_per_target[target_idx] += 1
+                max_depth = max(max_depth, int(tree.max_depth))
+                offset += n_nodes
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.int32),
+            trees_per_target=trees_per_target,
+            max_depth=max_depth,
+            n_features=int(forests[0].n_features_in_),
+        )
+
+    def apply(self, X) -> np.ndarray:
+        """Return the leaf node index reached by each tree, shaped (n_trees, n_rows)."""
+        # sklearn trees split on float32 inputs; cast the same way for parity.
+        data = np.asarray(X, dtype=np.float32).astype(np.float64)
+        if data.ndim != 2 or data.shape[1] != self.n_features:
+            raise ValueError(f"Expected input with {self.n_features} features, got shape {data.shape}")
+        rows = np.arange(data.shape[0])[np.newaxis, :]
+        nodes = np.repeat(self.roots[:, np.newaxis], data.shape[0], axis=1)
+        for _ in range(self.max_depth):
+            go_left = data[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def predict(self, X) -> np.ndarray:
+        data = np.asarray(X)
+        if data.ndim != 2 or data.shape[0] <= PREDICT_BLOCK_ROWS:
+            return self._predict_block(data)
+        blocks = range(0, len(data), PREDICT_BLOCK_ROWS)
+        return np.concatenate([self._predict_block(data[start : start + PREDICT_BLOCK_ROWS]) for start in blocks])
+
+    def _predict_block(self, X) -> np.ndarray:
+        leaves = self.apply(X)
+        if self.per_target:
+            # Each target owns a consecutive run of trees; sum each run into its output column.
+            leaf_values = self.value[leaves]
+            ends = np.cumsum(self.trees_per_target)
+            totals = np.stack(
+                [leaf_values[end - count : end].sum(axis=0) for end, count in zip(ends, self.trees_per_target)], axis=1
+            )
+        else:
+            totals = self.value[leaves].sum(axis=0)
+        return totals / self.trees_per_target
+
+    def tree_predictions(self, X) -> np.ndarray:
+        """Every tree's output for every row, shaped (trees per target, n_rows, n_targets).
+
+        One traversal of all trees, like :meth:`predict`; the mean over the
+        first axis is the forest prediction and the spread is the
+        between-tree uncertainty. A joint forest's trees predict every
+        target; per-target forests contribute only their own target.
+        """
+        data = np.asarray(X)
+        if data.ndim != 2 or data.shape[0] <= PREDICT_BLOCK_ROWS:
+            return self._tree_predictions_block(data)
+        blocks = range(0, len(data), PREDICT_BLOCK_ROWS)
+        return np.concatenate(
+            [self._tree_predictions_block(data[start : start + PREDICT_BLOCK_ROWS]) for start in blocks], axis=1
+        )
+
+    def _tree_predictions_block(self, X) -> np.ndarray:
+        leaves = self.apply(X)
+        if not self.per_target:
+            return self.value[leaves]
+        per_target = int(self.trees_per_target[0])
+        if np.any(self.trees_per_target != per_target):
+            raise ValueError("Per-tree outputs need the same number of trees for every target")
+        values = self.value[leaves].reshape(self.n_targets, per_target, leaves.shape[1])
+        return values.transpose(1, 2, 0)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            "feature": self.feature,
+            "threshold": self.threshold,
+            "left": self.left,
+            "right": self.right,
+            "value": self.value,
+            "roots": self.roots,
+            "trees_per_target": self.trees_per_target,
+            "max_depth": np.int64(self.max_depth),
+            "n_features": np.int64(self.n_features),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Mapping[str, np.ndarray]) -> "CompiledForest":
+        value = arrays["value"]
+        trees_per_target = arrays["trees_per_target"]
+        if value.ndim == 2 and value.shape[1] > 1 and np.all(trees_per_target != len(arrays["roots"])):
+            # Files written before per-target forests were stored compactly carry a dense
+            # (n_nodes, n_targets) matrix with zeros outside each tree's own target.
+            node_counts = np.diff(np.append(arrays["roots"], len(value)))
+            tree_target = np.repeat(np.arange(len(trees_per_target)), trees_per_target)
+            value = value[np.arange(len(value)), np.repeat(tree_target, node_counts)]
+        return cls(
+            feature=arrays["feature"],
+            threshold=arrays["threshold"],
+            left=arrays["left"],
+            right=arrays["right"],
+            value=value,
+            roots=arrays["roots"],
+            trees_per_target=trees_per_target,
+            max_depth=int(arrays["max_depth"]),
+            n_features=int(arrays["n_features"]),
+        )
+
+    def save(self, path: Path) -> None:
+        save_npz_atomic(path, self.to_arrays())
+
+    @classmethod
+    def load(cls, path: Path, mmap: bool = False) -> "CompiledForest":
+        return cls.from_arrays(load_npz(path, mmap=mmap))
@@ -2,12 +2,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 BASE_DIR = Path(__file__).resolve().parent
 DATASET_DIR = BASE_DIR.parent / "backend" / "datasets"
 MODELS_DIR = BASE_DIR / "models"
 CACHE_DIR = BASE_DIR / "datasets"
+COLUMNAR_CACHE_DIR = CACHE_DIR / "columnar"
 
 MODELS_DIR.mkdir(parents=True, exist_ok=True)
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
@@ -68,6 +69,36 @@ LOCATION_PROFILES: List[LocationProfile] = [
     ),
 ]
 
+@dataclass(frozen=True)
+class RegionalDataset:
+    """Per-county raw files under ``DATASET_DIR``; any of them may be absent."""
+
+    key: str
+    business_file: Optional[str] = None
+    existing_business_file: Optional[str] = None
+    roads_file: Optional[str] = None
+    acs_file: Optional[str] = None
+
+
+REGIONAL_DATASETS: List[RegionalDataset] = [
+    RegionalDataset(
+        key="albany",
+        business_file="albanyBusinessTypes.json",
+        acs_file="acs_albany_raw.json",
+    ),
+    RegionalDataset(
+        key="troy",
+        business_file="troyBusinessTypes.json",
+        roads_file="troyRoads.json",
+    ),
+    RegionalDataset(
+        key="rensselaer",
+        business_file="rensselaerBusinessTypes.json",
+        roads_file="rensselaerRoads.json",
+        acs_file="acs_rensselaer_raw.json",
+    ),
+]
+
 BUSINESS_TYPE_INFO: Dict[str, Dict[str, float]] = {
     "grocery": {
         "avg_spend": 48.0,
@@ -110,6 +141,14 @@ BUSINESS_TYPE_ALIASES: Dict[str, List[str]] = {
     "entertainment": ["entertainment", "theater", "cinema", "venue"],
 }
 
+# Flattened alias -> canonical map. Iterating in reverse lets the first canonical type that
+# lists an alias win, matching a front-to-back scan of BUSINESS_TYPE_ALIASES.
+BUSINESS_TYPE_LOOKUP: Dict[str, str] = {
+    name: canonical
+    for canonical, aliases in reversed(list(BUSINESS_TYPE_ALIASES.items()))
+    for name in (canonical, *aliases)
+}
+
 SCALE_FACTORS: Dict[str, float] = {
     "small": 0.65,
     "medium": 1.0,
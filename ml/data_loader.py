@@ -1,85 +1,310 @@
 from __future__ import annotations
 
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from functools import cached_property
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
 from ml import config
+from ml.columnar_cache import ColumnarCache
+from ml.config import RegionalDataset
+
+try:
+    import ijson  # type: ignore
+except ImportError as exc:  # pragma: no cover - dependency checked at runtime
+    raise RuntimeError(
+        "ijson is required for streaming OSM road data. Ensure ml/requirements.txt is installed"
+    ) from exc
+
+BUSINESS_SCHEMA = "businesses-v2"
+ROADS_SCHEMA = "road-segments-v2"
+ROAD_COLUMNS = ("lat1", "lon1", "lat2", "lon2", "way_id")
+
+
+def _load_json_rows(path: Path) -> List:
+    with path.open("r", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def _load_osm_elements(path: Path) -> List[Dict]:
+    data = _load_json_rows(path)
+    if isinstance(data, dict):
+        return data.get("elements", [])
+    raise ValueError(f"Unexpected OSM structure in {path.name}")
+
+
+def _extract_business_records(path: Path) -> List[Dict]:
+    records: List[Dict] = []
+    for element in _load_osm_elements(path):
+        lat = element.get("lat")
+        lon = element.get("lon")
+        if lat is None or lon is None:
+            continue
+        tags = element.get("tags", {})
+        records.append(
+            {
+                "osm_id": element.get("id"),
+                "lat": float(lat),
+                "lon": float(lon),
+                "category": tags.get("shop") or tags.get("amenity") or tags.get("craft"),
+                "name": tags.get("name"),
+            }
+        )
+    return records
+
+
+def _parse_acs_frame(path: Path) -> pd.DataFrame:
+    rows = _load_json_rows(path)
+    header, data_rows = rows[0], rows[1:]
+    frame = pd.DataFrame(data_rows, columns=header)
+    column_mapping = {
+        "B01003_001E": "population",
+        "B19013_001E": "median_income",
+        "B23025_005E": "unemployed",
+        "B23025_003E": "labor_force",
+        "tract": "tract",
+        "NAME": "name",
+    }
+    frame = frame.rename(columns=column_mapping)
+    numeric_columns = ["population", "median_income", "unemployed", "labor_force"]
+    for col in numeric_columns:
+        frame[col] = pd.to_numeric(frame[col], errors="coerce")
+    frame["tract"] = frame["tract"].astype(str)
+    return frame
+
+
+def _parse_road_segments(path: Path) -> Dict[str, np.ndarray]:
+    lats: List[np.ndarray] = []
+    lons: List[np.ndarray] = []
+    way_ids: List[int] = []
+    with path.open("rb") as fh:
+        for element in ijson.items(fh, "elements.item", use_float=True):
+            if element.get("type") != "way":
+                continue
+            geometry = element.get("geometry") or []
+            if len(geometry) < 2:
+                continue
+            lats.append(np.array([point["lat"] for point in geometry], dtype=np.float64))
+            lons.append(np.array([point["lon"] for point in geometry], dtype=np.float64))
+            way_ids.append(int(element.get("id", -1)))
+    if not lats:
+        return {
+            "lat1": np.empty(0, dtype=np.float64),
+            "lon1": np.empty(0, dtype=np.float64),
+            "lat2": np.empty(0, dtype=np.float64),
+            "lon2": np.empty(0, dtype=np.float64),
+            "way_id": np.empty(0, dtype=np.int64),
+        }
+    return {
+        "lat1": np.concatenate([way[:-1] for way in lats]),
+        "lon1": np.concatenate([way[:-1] for way in lons]),
+        "lat2": np.concatenate([way[1:] for way in lats]),
+        "lon2": np.concatenate([way[1:] for way in lons]),
+        "way_id": np.repeat(np.asarray(way_ids, dtype=np.int64), [way.size - 1 for way in lats]),
+    }
+
+
+def _read_business_frame(path: Path, cache_dir: Optional[Path]) -> pd.DataFrame:
+    def build() -> pd.DataFrame:
+        return pd.DataFrame(_extract_business_records(path))
+
+    if cache_dir is None:
+        return build()
+    return ColumnarCache(cache_dir).load_frame(path, build, schema=BUSINESS_SCHEMA)
+
+
+def _read_road_segments(path: Path, cache_dir: Optional[Path]) -> Dict[str, np.ndarray]:
+    if cache_dir is None:
+        return _parse_road_segments(path)
+    return ColumnarCache(cache_dir).load_arrays(path, lambda: _parse_road_segments(path), schema=ROADS_SCHEMA)
+
+
+def _read_acs_frame(path: Path, cache_dir: Optional[Path]) -> pd.DataFrame:
+    return _parse_acs_frame(path)
+
+
+_READERS: Dict[str, Callable] = {
+    "business": _read_business_frame,
+    "existing": _read_business_frame,
+    "roads": _read_road_segments,
+    "acs": _read_acs_frame,
+}
+
+
+def _read_dataset(kind: str, path: Path, cache_dir: Optional[Path]):
+    result = _READERS[kind](path, cache_dir)
+    if kind == "roads":
+        # Memory-mapped arrays cannot cross a process boundary cheaply; hand back plain arrays.
+        return {key: np.asarray(values) for key, values in result.items()}
+    return result
+
+
+def classify_business_types(categories: pd.Series) -> pd.Categorical:
+    """Map raw OSM categories onto canonical business types.
+
+    Only the distinct category values go through the alias lookup, so the
+    Python work scales with the vocabulary rather than the number of rows.
+    """
+    codes, uniques = pd.factorize(categories.astype(object))
+    canonical = [config.BUSINESS_TYPE_LOOKUP.get(str(value).lower()) for value in uniques]
+    type_codes = np.array(
+        [list(config.BUSINESS_TYPE_INFO).index(name) if name else -1 for name in canonical] + [-1],
+        dtype=np.int8,
+    )
+    # factorize marks missing values with -1, which indexes the trailing "unclassified" slot.
+    return pd.Categorical.from_codes(type_codes[codes], categories=list(config.BUSINESS_TYPE_INFO))
+
+
+def _with_business_types(frame: pd.DataFrame) -> pd.DataFrame:
+    if frame.empty or "category" not in frame.columns:
+        return frame
+    frame = frame.copy()
+    frame["business_type"] = classify_business_types(frame["category"])
+    return frame
+
+
+def _merge_business_frames(frames: Sequence[pd.DataFrame]) -> pd.DataFrame:
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+    # Regional Overpass extracts overlap at county lines; keep each OSM node once.
+    merged = pd.concat(frames, ignore_index=True)
+    return merged.drop_duplicates(subset="osm_id", keep="first").reset_index(drop=True)
+
+
+def _merge_road_segments(parts: Sequence[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    merged: Dict[str, List[np.ndarray]] = {key: [] for key in ROAD_COLUMNS}
+    seen = np.empty(0, dtype=np.int64)
+    for part in parts:
+        keep = ~np.isin(part["way_id"], seen)
+        for key in ROAD_COLUMNS:
+            merged[key].append(np.asarray(part[key])[keep])
+        seen = np.union1d(seen, part["way_id"])
+    return {
+        key: np.concatenate(values) if values else np.empty(0, dtype=np.int64 if key == "way_id" else np.float64)
+        for key, values in merged.items()
+    }
 
 
 @dataclass
 class DatasetLoader:
-    """Eagerly loads datasets with caching to avoid repeated disk I/O."""
+    """Eagerly loads datasets with caching to avoid repeated disk I/O.
+
+    Without ``regions`` the loader reads the single legacy files
+    (``businessTypes.json``, ``roads.json``, ``acs_albany_raw.json``). With a
+    list of :class:`~ml.config.RegionalDataset` entries every regional file is
+    parsed in a process pool and the results are merged into the same frames.
+    The trainer and the prediction service load ``config.REGIONAL_DATASETS``,
+    the files actually shipped in ``backend/datasets``.
+    """
 
     dataset_dir: Path = config.DATASET_DIR
+    columnar_cache_dir: Optional[Path] = config.COLUMNAR_CACHE_DIR
+    regions: Optional[Sequence[RegionalDataset]] = None
+    max_workers: Optional[int] = None
+
+    @cached_property
+    def _regional_data(self) -> Dict[str, List]:
+        tasks: List[Tuple[str, Path]] = []
+        for region in self.regions or []:
+            for kind, filename in (
+                ("business", region.business_file),
+                ("existing", region.existing_business_file),
+                ("roads", region.roads_file),
+                ("acs", region.acs_file),
+            ):
+                if filename:
+                    tasks.append((kind, self.dataset_dir / filename))
 
-    def _load_json_rows(self, filename: str) -> List:
-        path = self.dataset_dir / filename
-        with path.open("r", encoding="utf-8") as fh:
-            return json.load(fh)
+        workers = self.max_workers or min(len(tasks), os.cpu_count() or 1)
+        if workers <= 1 or len(tasks) <= 1:
+            results = [_read_dataset(kind, path, self.columnar_cache_dir) for kind, path in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_read_dataset, kind, path, self.columnar_cache_dir) for kind, path in tasks]
+                results = [future.result() for future in futures]
 
-    def _load_osm_elements(self, filename: str) -> List[Dict]:
-        data = self._load_json_rows(filename)
-        if isinstance(data, dict):
-            return data.get("elements", [])
-        raise ValueError(f"Unexpected OSM structure in {filename}")
+        grouped: Dict[str, List] = {kind: [] for kind in _READERS}
+        for (kind, _), result in zip(tasks, results):
+            grouped[kind].append(result)
+        return grouped
 
     @cached_property
     def acs_df(self) -> pd.DataFrame:
-        rows = self._load_json_rows("acs_albany_raw.json")
-        header, data_rows = rows[0], rows[1:]
-        frame = pd.DataFrame(data_rows, columns=header)
-        column_mapping = {
-            "B01003_001E": "population",
-            "B19013_001E": "median_income",
-            "B23025_005E": "unemployed",
-            "B23025_003E": "labor_force",
-            "tract": "tract",
-            "NAME": "name",
-        }
-        frame = frame.rename(columns=column_mapping)
-        numeric_columns = ["population", "median_income", "unemployed", "labor_force"]
-        for col in numeric_columns:
-            frame[col] = pd.to_numeric(frame[col], errors="coerce")
-        frame["tract"] = frame["tract"].astype(str)
-        return frame
+        if self.regions is None:
+            return _parse_acs_frame(self.dataset_dir / "acs_albany_raw.json")
+        frames = self._regional_data["acs"]
+        if not frames:
+            raise FileNotFoundError("No regional dataset provides an ACS file")
+        merged = pd.concat(frames, ignore_index=True)
+        key_columns = [col for col in ("state", "county", "tract") if col in merged.columns]
+        return merged.drop_duplicates(subset=key_columns, keep="first").reset_index(drop=True)
 
     @cached_property
     def business_df(self) -> pd.DataFrame:
-        return pd.DataFrame(self._extract_business_records("businessTypes.json"))
+        if self.regions is None:
+            frame = _read_business_frame(self.dataset_dir / "businessTypes.json", self.columnar_cache_dir)
+        else:
+            frame = _merge_business_frames(self._regional_data["business"])
+        return _with_business_types(frame)
 
     @cached_property
     def existing_business_df(self) -> pd.DataFrame:
-        return pd.DataFrame(self._extract_business_records("existingBusinessCount.json"))
-
-    def _extract_business_records(self, filename: str) -> List[Dict]:
-        elements = self._load_osm_elements(filename)
-        records: List[Dict] = []
-        for element in elements:
-            lat = element.get("lat")
-            lon = element.get("lon")
-            if lat is None or lon is None:
-                continue
-            tags = element.get("tags", {})
-            records.append(
-                {
-                    "lat": float(lat),
-                    "lon": float(lon),
-                    "category": tags.get("shop") or tags.get("amenity") or tags.get("craft"),
-                    "name": tags.get("name"),
-                }
-            )
-        return records
+        if self.regions is None:
+            return _read_business_frame(self.dataset_dir / "existingBusinessCount.json", self.columnar_cache_dir)
+        frames = self._regional_data["existing"]
+        if not frames:
+            # Regions without a dedicated existing-business census fall back to their business extracts.
+            return self.business_df
+        return _merge_business_frames(frames)
 
     @cached_property
     def transit_df(self) -> pd.DataFrame:
         path = self.dataset_dir / "google_transit" / "stops.txt"
-        return pd.read_csv(path)
+        if self.columnar_cache_dir is None:
+            return pd.read_csv(path)
+        return ColumnarCache(self.columnar_cache_dir).load_frame(path, lambda: pd.read_csv(path))
+
+    def dataset_sources(self) -> Dict[str, List[Path]]:
+        """Source files behind each dataset group, for cache fingerprinting."""
+        transit = [self.dataset_dir / "google_transit" / "stops.txt"]
+        if self.regions is None:
+            return {
+                "acs": [self.dataset_dir / "acs_albany_raw.json"],
+                "business": [self.dataset_dir / "businessTypes.json"],
+                "existing": [self.dataset_dir / "existingBusinessCount.json"],
+                "transit": transit,
+                "roads": [self.roads_path],
+            }
+
+        def regional(attribute: str) -> List[Path]:
+            return [
+                self.dataset_dir / getattr(region, attribute)
+                for region in self.regions
+                if getattr(region, attribute)
+            ]
+
+        return {
+            "acs": regional("acs_file"),
+            "business": regional("business_file"),
+            "existing": regional("existing_business_file") or regional("business_file"),
+            "transit": transit,
+            "roads": regional("roads_file"),
+        }
 
     @property
     def roads_path(self) -> Path:
         return self.dataset_dir / "roads.json"
+
+    @cached_property
+    def road_segments(self) -> Dict[str, np.ndarray]:
+        """Endpoints of every way segment as ``lat1``/``lon1``/``lat2``/``lon2`` arrays."""
+        if self.regions is None:
+            return _read_road_segments(self.roads_path, self.columnar_cache_dir)
+        return _merge_road_segments(self._regional_data["roads"])
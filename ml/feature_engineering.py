@@ -1,47 +1,58 @@
 from __future__ import annotations
 
 import json
-from dataclasses import asdict, dataclass
+import os
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
 
 from ml import config
 from ml.config import BUSINESS_TYPE_INFO, LOCATION_PROFILES, LocationProfile
-from ml.data_loader import DatasetLoader
+from ml.data_loader import DatasetLoader, classify_business_types
+from ml.location_metrics import LocationMetrics, build_feature_vector
 from ml.target_calculator import TargetCalculator
-from ml.utils.geo import bbox_area_km2, point_in_bbox, segment_intersects_bbox, haversine_km
-
-try:
-    import ijson  # type: ignore
-except ImportError as exc:  # pragma: no cover - dependency checked at runtime
-    raise RuntimeError(
-        "ijson is required for streaming OSM road data. Ensure ml/requirements.txt is installed"
-    ) from exc
-
-
-@dataclass
-class LocationMetrics:
-    population: float
-    population_density: float
-    median_income: float
-    unemployment_rate: float
-    existing_business_count: float
-    business_type_counts: Dict[str, int]
-    road_density: float
-    transit_score: float
-    area_km2: float
-
-    def to_json(self) -> Dict:
-        payload = asdict(self)
-        payload["business_type_counts"] = dict(self.business_type_counts)
-        return payload
+from ml.utils.geo import (
+    bbox_area_km2,
+    bbox_bounds_array,
+    decimal_tie_bounds,
+    haversine_km_array,
+)
+from ml.utils.hashing import combined_fingerprint, json_fingerprint
+from ml.utils.spatial_index import BoxGrid, PointGrid
+
+
+METRICS_CACHE_VERSION = 2
+TRAINING_CHUNK_ROWS = 65536
+TRAINING_LABEL_COLUMNS = ("location_key", "business_type", "scale")
+
+# Which dataset each LocationMetrics field is derived from; area_km2 depends on the profile alone.
+METRIC_GROUPS: Dict[str, Tuple[str, ...]] = {
+    "acs": ("population", "population_density", "median_income", "unemployment_rate"),
+    "business": ("business_type_counts",),
+    "existing": ("existing_business_count",),
+    "transit": ("transit_score",),
+    "roads": ("road_density",),
+}
+
+
+def profile_fingerprint(profile: LocationProfile) -> str:
+    """Fingerprint the parts of a profile that metrics are computed from."""
+    return json_fingerprint({
+        "key": profile.key,
+        "bounding_box": profile.bounding_box.as_dict(),
+        "tract_ids": list(profile.tract_ids),
+    })
 
 
 class LocationFeatureRepository:
-    """Aggregates spatial metrics for each configured location profile."""
+    """Aggregates spatial metrics for each configured location profile.
+
+    The cache records a content fingerprint per dataset group and per profile,
+    so only profiles whose definition changed, and only metric groups whose
+    dataset changed, are recomputed on load.
+    """
 
     def __init__(self, loader: DatasetLoader, cache_path: Path | None = None):
         self.loader = loader
@@ -49,44 +60,140 @@ class LocationFeatureRepository:
         self._metrics = self._load_or_build()
 
     def _load_or_build(self) -> Dict[str, LocationMetrics]:
-        if self.cache_path.exists():
-            with self.cache_path.open("r", encoding="utf-8") as fh:
-                payload = json.load(fh)
-            return {key: LocationMetrics(**value) for key, value in payload.items()}
-        metrics = self._build_metrics()
-        with self.cache_path.open("w", encoding="utf-8") as fh:
-            json.dump({k: v.to_json() for k, v in metrics.items()}, fh, indent=2)
-        return metrics
+        cached = self._read_cache()
+        dataset_fingerprints = self._dataset_fingerprints()
+        stored_datasets = cached["datasets"]
+        stored_profiles = cached["profiles"]
 
-    def _build_metrics(self) -> Dict[str, LocationMetrics]:
-        acs_df = self.loader.acs_df
-        business_df = self.loader.business_df
-        existing_df = self.loader.existing_business_df
-        transit_df = self.loader.transit_df
-        road_lengths = self._summarize_roads()
-
-        metrics: Dict[str, LocationMetrics] = {}
+        # A group whose sources are missing keeps its cached values; it cannot be rebuilt anyway.
+        stale_groups = [
+            group
+            for group, fingerprint in dataset_fingerprints.items()
+            if fingerprint is not None and fingerprint != stored_datasets.get(group)
+        ]
+        fields: Dict[str, Dict] = {}
+        changed_profiles: List[LocationProfile] = []
         for profile in LOCATION_PROFILES:
-            area = bbox_area_km2(profile.bounding_box)
-            pop_stats = self._compute_population_stats(acs_df, profile)
-            business_counts = self._count_businesses(business_df, profile)
-            same_type_total = sum(business_counts.values())
-            existing_count = self._count_points(existing_df, profile)
-            transit_score = self._compute_transit_score(transit_df, profile, area)
-            road_density = road_lengths.get(profile.key, 0.0) / area
-            metrics[profile.key] = LocationMetrics(
-                population=pop_stats["population"],
-                population_density=pop_stats["population"] / area,
-                median_income=pop_stats["median_income"],
-                unemployment_rate=pop_stats["unemployment_rate"],
-                existing_business_count=float(existing_count),
-                business_type_counts=business_counts,
-                road_density=road_density,
-                transit_score=transit_score,
-                area_km2=area,
-            )
+            entry = stored_profiles.get(profile.key)
+            if entry is None or entry["fingerprint"] != profile_fingerprint(profile):
+                changed_profiles.append(profile)
+            else:
+                fields[profile.key] = dict(entry["metrics"])
+
+        if changed_profiles:
+            for key, values in self._compute_metric_groups(changed_profiles, list(METRIC_GROUPS)).items():
+                fields[key] = values
+        unchanged = [profile for profile in LOCATION_PROFILES if profile not in changed_profiles]
+        if stale_groups and unchanged:
+            for key, values in self._compute_metric_groups(unchanged, stale_groups).items():
+                fields[key].update(values)
+
+        metrics = {
+            profile.key: LocationMetrics(**fields[profile.key]) for profile in LOCATION_PROFILES
+        }
+        removed = set(stored_profiles) - {profile.key for profile in LOCATION_PROFILES}
+        if changed_profiles or stale_groups or removed or cached["legacy"]:
+            merged_datasets = {
+                group: fingerprint if fingerprint is not None else stored_datasets.get(group)
+                for group, fingerprint in dataset_fingerprints.items()
+            }
+            self._write_cache(metrics, merged_datasets)
         return metrics
 
+    def _read_cache(self) -> Dict:
+        empty = {"datasets": {}, "profiles": {}, "legacy": False}
+        if not self.cache_path.exists():
+            return empty
+        with self.cache_path.open("r", encoding="utf-8") as fh:
+            payload = json.load(fh)
+        if payload.get("version") == METRICS_CACHE_VERSION:
+            return {"datasets": payload["datasets"], "profiles": payload["profiles"], "legacy": False}
+        # Pre-fingerprint caches are a flat {profile_key: metrics} mapping that the old code trusted
+        # unconditionally; adopt them for the current profile definitions and let dataset checks decide.
+        profiles = {
+            profile.key: {"fingerprint": profile_fingerprint(profile), "metrics": payload[profile.key]}
+            for profile in LOCATION_PROFILES
+            if profile.key in payload
+        }
+        return {"datasets": {}, "profiles": profiles, "legacy": True}
+
+    def _write_cache(self, metrics: Dict[str, LocationMetrics], datasets: Dict[str, str | None]) -> None:
+        profiles_by_key = {profile.key: profile for profile in LOCATION_PROFILES}
+        payload = {
+            "version": METRICS_CACHE_VERSION,
+            "datasets": datasets,
+            "profiles": {
+                key: {"fingerprint": profile_fingerprint(profiles_by_key[key]), "metrics": value.to_json()}
+                for key, value in metrics.items()
+            },
+        }
+        # Every worker rebuilds stale metrics at startup; write aside and rename so a concurrent
+        # reader or a crash mid-write never leaves a truncated cache behind.
+        tmp_path = self.cache_path.with_name(f".{self.cache_path.name}.{os.getpid()}.tmp")
+        try:
+            with tmp_path.open("w", encoding="utf-8") as fh:
+                json.dump(payload, fh, indent=2)
+            os.replace(tmp_path, self.cache_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def _dataset_fingerprints(self) -> Dict[str, str | None]:
+        fingerprints: Dict[str, str | None] = {}
+        for group, paths in self.loader.dataset_sources().items():
+            if all(path.exists() for path in paths):
+                fingerprints[group] = combined_fingerprint(paths)
+            else:
+                fingerprints[group] = None
+        return fingerprints
+
+    def _compute_metric_groups(
+        self, profiles: Sequence[LocationProfile], groups: Sequence[str]
+    ) -> Dict[str, Dict]:
+        """Compute the LocationMetrics fields of ``groups`` for ``profiles`` only.
+
+        Datasets are loaded lazily, so groups that are not requested are never parsed.
+        """
+        fields: Dict[str, Dict] = {
+            profile.key: {"area_km2": bbox_area_km2(profile.bounding_box)} for profile in profiles
+        }
+        if "acs" in groups:
+            acs_df = self.loader.acs_df
+            for profile in profiles:
+                area = fields[profile.key]["area_km2"]
+                pop_stats = self._compute_population_stats(acs_df, profile)
+                fields[profile.key].update(
+                    population=pop_stats["population"],
+                    population_density=pop_stats["population"] / area,
+                    median_income=pop_stats["median_income"],
+                    unemployment_rate=pop_stats["unemployment_rate"],
+                )
+        if "business" in groups:
+            business_df = self.loader.business_df
+            business_index = PointGrid.from_frame(business_df)
+            for key, counts in self._count_businesses_by_profile(business_df, profiles, business_index).items():
+                fields[key]["business_type_counts"] = counts
+        if "existing" in groups:
+            existing_df = self.loader.existing_business_df
+            existing_index = PointGrid.from_frame(existing_df)
+            for profile in profiles:
+                existing_count = self._count_points(existing_df, profile, existing_index)
+                fields[profile.key]["existing_business_count"] = float(existing_count)
+        if "transit" in groups:
+            transit_df = self.loader.transit_df
+            transit_index = PointGrid.from_frame(transit_df, "stop_lat", "stop_lon")
+            for profile in profiles:
+                area = fields[profile.key]["area_km2"]
+                fields[profile.key]["transit_score"] = self._compute_transit_score(
+                    transit_df, profile, area, transit_index
+                )
+        if "roads" in groups:
+            road_lengths = self._summarize_roads(profiles)
+            for profile in profiles:
+                area = fields[profile.key]["area_km2"]
+                fields[profile.key]["road_density"] = road_lengths.get(profile.key, 0.0) / area
+        return fields
+
     def _compute_population_stats(self, acs_df: pd.DataFrame, profile: LocationProfile) -> Dict[str, float]:
         subset = acs_df[acs_df["tract"].isin(profile.tract_ids)]
         if subset.empty:
@@ -105,72 +212,63 @@ class LocationFeatureRepository:
             "unemployment_rate": float(unemployment_rate),
         }
 
-    def _count_businesses(self, business_df: pd.DataFrame, profile: LocationProfile) -> Dict[str, int]:
-        counts = {key: 0 for key in BUSINESS_TYPE_INFO}
+    def _count_businesses(
+        self, business_df: pd.DataFrame, profile: LocationProfile, index: PointGrid | None = None
+    ) -> Dict[str, int]:
+        return self._count_businesses_by_profile(business_df, [profile], index)[profile.key]
+
+    def _count_businesses_by_profile(
+        self, business_df: pd.DataFrame, profiles: Sequence[LocationProfile], index: PointGrid | None = None
+    ) -> Dict[str, Dict[str, int]]:
+        """Count classified businesses per profile with a single bincount over (profile, type)."""
+        type_names = list(BUSINESS_TYPE_INFO)
         if business_df.empty:
-            return counts
-        bbox = profile.bounding_box
-        subset = business_df[
-            (business_df["lat"] >= bbox.min_lat)
-            & (business_df["lat"] <= bbox.max_lat)
-            & (business_df["lon"] >= bbox.min_lon)
-            & (business_df["lon"] <= bbox.max_lon)
-        ]
-        for _, row in subset.iterrows():
-            category = self._canonical_business_type(str(row.get("category", "")))
-            if category:
-                counts[category] += 1
-        return counts
+            return {profile.key: {key: 0 for key in type_names} for profile in profiles}
+        if index is None:
+            index = PointGrid.from_frame(business_df)
+        if "business_type" in business_df.columns:
+            type_codes = business_df["business_type"].cat.codes.to_numpy()
+        else:
+            type_codes = classify_business_types(business_df["category"]).codes
+        hits = [index.query_bbox(profile.bounding_box) for profile in profiles]
+        rows = np.concatenate(hits) if hits else np.empty(0, dtype=np.int64)
+        owners = np.repeat(np.arange(len(profiles)), [hit.size for hit in hits])
+        codes = type_codes[rows]
+        classified = codes >= 0
+        table = np.bincount(
+            owners[classified] * len(type_names) + codes[classified],
+            minlength=len(profiles) * len(type_names),
+        ).reshape(len(profiles), len(type_names))
+        return {
+            profile.key: {name: int(count) for name, count in zip(type_names, row)}
+            for profile, row in zip(profiles, table)
+        }
 
-    def _count_points(self, df: pd.DataFrame, profile: LocationProfile) -> int:
+    def _count_points(self, df: pd.DataFrame, profile: LocationProfile, index: PointGrid | None = None) -> int:
         if df.empty:
             return 0
-        bbox = profile.bounding_box
-        subset = df[
-            (df["lat"] >= bbox.min_lat)
-            & (df["lat"] <= bbox.max_lat)
-            & (df["lon"] >= bbox.min_lon)
-            & (df["lon"] <= bbox.max_lon)
-        ]
-        return int(len(subset))
+        if index is None:
+            index = PointGrid.from_frame(df)
+        return index.count_bbox(profile.bounding_box)
 
-    def _compute_transit_score(self, transit_df: pd.DataFrame, profile: LocationProfile, area: float) -> float:
+    def _compute_transit_score(
+        self, transit_df: pd.DataFrame, profile: LocationProfile, area: float, index: PointGrid | None = None
+    ) -> float:
         if transit_df.empty:
             return 0.0
-        subset = transit_df[
-            (transit_df["stop_lat"] >= profile.bounding_box.min_lat)
-            & (transit_df["stop_lat"] <= profile.bounding_box.max_lat)
-            & (transit_df["stop_lon"] >= profile.bounding_box.min_lon)
-            & (transit_df["stop_lon"] <= profile.bounding_box.max_lon)
-        ]
-        stops_per_km2 = len(subset) / area
+        if index is None:
+            index = PointGrid.from_frame(transit_df, "stop_lat", "stop_lon")
+        stops_per_km2 = index.count_bbox(profile.bounding_box) / area
         return min(stops_per_km2 * 10, config.TRANSIT_SCORE_SCALE)
 
-    def _summarize_roads(self) -> Dict[str, float]:
-        totals = {profile.key: 0.0 for profile in LOCATION_PROFILES}
-        with self.loader.roads_path.open("rb") as fh:
-            for element in ijson.items(fh, "elements.item"):
-                if element.get("type") != "way":
-                    continue
-                geometry = element.get("geometry") or []
-                if len(geometry) < 2:
-                    continue
-                for idx in range(len(geometry) - 1):
-                    p1 = geometry[idx]
-                    p2 = geometry[idx + 1]
-                    for profile in LOCATION_PROFILES:
-                        if segment_intersects_bbox(p1, p2, profile.bounding_box):
-                            totals[profile.key] += haversine_km(p1["lat"], p1["lon"], p2["lat"], p2["lon"])
-        return totals
-
-    def _canonical_business_type(self, raw: str | None) -> str | None:
-        if not raw:
-            return None
-        normalized = raw.lower()
-        for canonical, aliases in config.BUSINESS_TYPE_ALIASES.items():
-            if normalized == canonical or normalized in aliases:
-                return canonical
-        return None
+    def _summarize_roads(self, profiles: Sequence[LocationProfile] = LOCATION_PROFILES) -> Dict[str, float]:
+        roads = self.loader.road_segments
+        lat1, lon1, lat2, lon2 = (roads[key] for key in ("lat1", "lon1", "lat2", "lon2"))
+        bounds = decimal_tie_bounds(bbox_bounds_array([profile.bounding_box for profile in profiles]))
+        segments, boxes = BoxGrid(bounds).segment_pairs(lat1, lon1, lat2, lon2)
+        lengths = haversine_km_array(lat1[segments], lon1[segments], lat2[segments], lon2[segments])
+        totals = np.bincount(boxes, weights=lengths, minlength=len(profiles))
+        return {profile.key: float(total) for profile, total in zip(profiles, totals)}
 
     def get_metrics(self, profile_key: str) -> LocationMetrics:
         try:
@@ -189,44 +287,78 @@ class FeatureEngineer:
 
     def build_feature_vector(self, location_key: str, business_type: str, scale: str) -> Dict[str, float]:
         metrics = self.repository.get_metrics(location_key)
-        features: Dict[str, float] = {
-            "population_density": metrics.population_density,
-            "median_income": metrics.median_income,
-            "unemployment_rate": metrics.unemployment_rate,
-            "existing_business_count": metrics.existing_business_count,
-            "road_density": metrics.road_density,
-            "transit_score": metrics.transit_score,
-            "same_type_business_share": self._same_type_share(metrics, business_type),
-            "scale_value": config.SCALE_FACTORS.get(scale, 1.0),
-        }
-        for name in BUSINESS_TYPE_INFO.keys():
-            features[f"business_type_{name}"] = 1.0 if name == business_type else 0.0
-        return features
+        return self.build_feature_vector_from_metrics(metrics, business_type, scale)
 
-    def _same_type_share(self, metrics: LocationMetrics, business_type: str) -> float:
-        total = sum(metrics.business_type_counts.values()) or 1
-        same_type = metrics.business_type_counts.get(business_type, 0)
-        return same_type / total
+    def build_feature_vector_from_metrics(
+        self, metrics: LocationMetrics, business_type: str, scale: str
+    ) -> Dict[str, float]:
+        return build_feature_vector(metrics, business_type, scale)
 
     def generate_training_frame(self, replicates: int = 4) -> pd.DataFrame:
-        records: List[Dict[str, float]] = []
+        """Noisy replicates of every (location, business type, scale) combination.
+
+        Rows are laid out combination-major and the noise is drawn per
+        combination as one (replicates, nonzero features) block, which is the
+        same order the per-value draws used to follow, so a given seed yields
+        the same frame. Label columns are categoricals.
+        """
+        return next(self.iter_training_chunks(replicates, chunk_rows=None))
+
+    def iter_training_chunks(
+        self, replicates: int = 4, chunk_rows: int | None = TRAINING_CHUNK_ROWS
+    ) -> Iterator[pd.DataFrame]:
+        """Yield the rows of :meth:`generate_training_frame` a few combinations at a time.
+
+        Each chunk holds whole combinations and roughly ``chunk_rows`` rows
+        (``None`` yields everything as one frame). Chunks share category
+        tables, so concatenating them reproduces the full frame exactly.
+        """
         rng = np.random.default_rng(seed=42)
-        for profile in LOCATION_PROFILES:
-            for business_type in BUSINESS_TYPE_INFO.keys():
-                for scale in config.SCALE_FACTORS.keys():
-                    features = self.build_feature_vector(profile.key, business_type, scale)
-                    targets = TargetCalculator.calculate(profile.key, business_type, scale, self.repository)
-                    for _ in range(replicates):
-                        noisy_features = {
-                            key: value * (1 + rng.normal(0, config.TRAINING_NOISE_STD)) if value else value
-                            for key, value in features.items()
-                        }
-                        records.append({
-                            **noisy_features,
-                            **targets,
-                            "location_key": profile.key,
-                            "business_type": business_type,
-                            "scale": scale,
-                        })
-        frame = pd.DataFrame.from_records(records)
-        return frame
+        grid, base, columns, n_features = self._training_base()
+        labels = {
+            column: pd.factorize(pd.Index([combo[position] for combo in grid]))
+            for position, column in enumerate(TRAINING_LABEL_COLUMNS)
+        }
+        combos_per_chunk = len(grid) if chunk_rows is None else max(chunk_rows // max(replicates, 1), 1)
+        for start in range(0, len(grid), combos_per_chunk):
+            stop = min(start + combos_per_chunk, len(grid))
+            values = np.empty(((stop - start) * replicates, base.shape[1]), dtype=np.float64)
+            values.reshape(stop - start, replicates, base.shape[1])[:] = base[start:stop, np.newaxis, :]
+            for offset, combo_idx in enumerate(range(start, stop)):
+                # Zero-valued features were never perturbed and drew no noise.
+                noisy = np.flatnonzero(base[combo_idx, :n_features])
+                factors = np.ones((replicates, n_features))
+                factors[:, noisy] += rng.normal(0, config.TRAINING_NOISE_STD, size=(replicates, noisy.size))
+                values[offset * replicates : (offset + 1) * replicates, :n_features] *= factors
+
+            # Features and targets share one float block so the DataFrame wraps it without copying.
+            frame = pd.DataFrame(values, columns=columns, copy=False)
+            for column, (codes, categories) in labels.items():
+                frame[column] = pd.Categorical.from_codes(
+                    np.repeat(codes[start:stop], replicates), categories=categories
+                )
+            yield frame
+
+    def _training_base(self) -> Tuple[List[Tuple[str, str, str]], np.ndarray, List[str], int]:
+        """Noise-free feature and target row for every training combination."""
+        grid = [
+            (profile.key, business_type, scale)
+            for profile in LOCATION_PROFILES
+            for business_type in BUSINESS_TYPE_INFO.keys()
+            for scale in config.SCALE_FACTORS.keys()
+        ]
+        feature_rows = [self.build_feature_vector(*combo) for combo in grid]
+        feature_names = list(feature_rows[0])
+        metrics = [self.repository.get_metrics(key) for key, _, _ in grid]
+        targets = TargetCalculator.calculate_batch(
+            median_income=[entry.median_income for entry in metrics],
+            population_density=[entry.population_density for entry in metrics],
+            transit_score=[entry.transit_score for entry in metrics],
+            business_types=[business_type for _, business_type, _ in grid],
+            scales=[scale for _, _, scale in grid],
+        )
+        base = np.column_stack(
+            [np.array([[row[name] for name in feature_names] for row in feature_rows], dtype=np.float64)]
+            + list(targets.values())
+        )
+        return grid, base, feature_names + list(targets), len(feature_names)
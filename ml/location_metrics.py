@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Dict
+
+from ml import config
+from ml.config import BUSINESS_TYPE_INFO
+
+
+@dataclass
+class LocationMetrics:
+    population: float
+    population_density: float
+    median_income: float
+    unemployment_rate: float
+    existing_business_count: float
+    business_type_counts: Dict[str, int]
+    road_density: float
+    transit_score: float
+    area_km2: float
+
+    def to_json(self) -> Dict:
+        payload = asdict(self)
+        payload["business_type_counts"] = dict(self.business_type_counts)
+        return payload
+
+
+def same_type_share(metrics: LocationMetrics, business_type: str) -> float:
+    total = sum(metrics.business_type_counts.values()) or 1
+    same_type = metrics.business_type_counts.get(business_type, 0)
+    return same_type / total
+
+
+def build_feature_vector(metrics: LocationMetrics, business_type: str, scale: str) -> Dict[str, float]:
+    """Model input row for one (location, business type, scale) combination.
+
+    Kept free of pandas so the serving path can build rows from a prebuilt
+    bundle without importing the training stack.
+    """
+    features: Dict[str, float] = {
+        "population_density": metrics.population_density,
+        "median_income": metrics.median_income,
+        "unemployment_rate": metrics.unemployment_rate,
+        "existing_business_count": metrics.existing_business_count,
+        "road_density": metrics.road_density,
+        "transit_score": metrics.transit_score,
+        "same_type_business_share": same_type_share(metrics, business_type),
+        "scale_value": config.SCALE_FACTORS.get(scale, 1.0),
+    }
+    for name in BUSINESS_TYPE_INFO.keys():
+        features[f"business_type_{name}"] = 1.0 if name == business_type else 0.0
+    return features
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import io
 import json
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Any, Dict, Tuple
 
 import joblib
+import numpy as np
 import pandas as pd
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_absolute_error, r2_score
@@ -13,8 +16,11 @@ from sklearn.model_selection import train_test_split
 from sklearn.multioutput import MultiOutputRegressor
 
 from ml import config
+from ml.compiled_forest import COMPILED_MODEL_FILENAME, CompiledForest
 from ml.data_loader import DatasetLoader
 from ml.feature_engineering import FeatureEngineer, LocationFeatureRepository
+from ml.serving_bundle import SERVING_BUNDLE_FILENAME, ServingBundle
+from ml.training_export import EXPORT_FORMATS, export_training_chunks, read_training_data
 
 
 @dataclass
@@ -23,23 +29,62 @@ class TrainingArtifacts:
     feature_columns_path: Path
     metadata_path: Path
     dataset_export_path: Path
+    compiled_model_path: Path
+    serving_bundle_path: Path
+
+
+FOREST_MODES = ("per_target", "joint")
+TRAINING_EXPORT_NAMES = {"columnar": "training_data", "jsonl": "training_data.jsonl"}
+LATENCY_REPEATS = 50
 
 
 class ModelTrainer:
-    def __init__(self, output_dir: Path | None = None):
+    """Trains the impact model and writes every serving artifact.
+
+    ``forest_mode="per_target"`` fits one forest per target through
+    ``MultiOutputRegressor``; ``"joint"`` fits a single native multi-output
+    forest. With ``compare_forest_modes`` the other mode is also fitted and
+    measured (but not saved) so ``model_metadata.json`` holds both side by
+    side. The training frame is exported in ``dataset_format`` (see
+    :mod:`ml.training_export`).
+    """
+
+    def __init__(
+        self,
+        output_dir: Path | None = None,
+        forest_mode: str = "per_target",
+        compare_forest_modes: bool = False,
+        dataset_format: str = "columnar",
+        loader: DatasetLoader | None = None,
+        dataset_output: Path | None = None,
+        metrics_cache_path: Path | None = None,
+    ):
+        if forest_mode not in FOREST_MODES:
+            raise ValueError(f"Unsupported forest mode: {forest_mode}")
+        if dataset_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported dataset format: {dataset_format}")
+        self.forest_mode = forest_mode
+        self.compare_forest_modes = compare_forest_modes
         self.output_dir = output_dir or config.MODELS_DIR
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        self.dataset_output = config.CACHE_DIR / "merged_training_data.json"
+        self.dataset_format = dataset_format
+        self.dataset_output = dataset_output or config.CACHE_DIR / TRAINING_EXPORT_NAMES[dataset_format]
+        self.loader = loader
+        self.metrics_cache_path = metrics_cache_path or self.output_dir / "location_metrics.json"
 
     def run(self) -> TrainingArtifacts:
-        loader = DatasetLoader()
-        repository = LocationFeatureRepository(loader)
+        loader = self.loader or DatasetLoader(regions=config.REGIONAL_DATASETS)
+        repository = LocationFeatureRepository(loader, cache_path=self.metrics_cache_path)
         engineer = FeatureEngineer(repository)
-        training_frame = engineer.generate_training_frame()
-
         feature_columns = engineer.feature_columns
         target_columns = config.TARGET_COLUMNS
 
+        # Stream the rows to the export as they are generated, then train from the export; the
+        # columnar format memory-maps the columns instead of holding a second in-memory frame.
+        dataset_export_path = self.dataset_output
+        n_samples = export_training_chunks(engineer.iter_training_chunks(), dataset_export_path, self.dataset_format)
+        training_frame = read_training_data(dataset_export_path, columns=feature_columns + target_columns)
+
         X = training_frame[feature_columns]
         y = training_frame[target_columns]
 
@@ -47,26 +92,35 @@ class ModelTrainer:
             X, y, test_size=0.2, random_state=42
         )
 
-        estimator = MultiOutputRegressor(
-            RandomForestRegressor(
-                n_estimators=300,
-                max_depth=18,
-                min_samples_split=4,
-                random_state=42,
-                n_jobs=-1,
-            )
+        estimator, predictions, mode_stats = self._fit_and_measure(
+            self.forest_mode, X_train, y_train, X_test, y_test, target_columns
         )
-        estimator.fit(X_train, y_train)
-
-        predictions = estimator.predict(X_test)
-        eval_stats = self._evaluate(y_test, predictions, target_columns)
+        eval_stats = {"r2": mode_stats["r2"], "mae": mode_stats["mae"]}
+        forest_modes = {self.forest_mode: mode_stats}
+        if self.compare_forest_modes:
+            for mode in FOREST_MODES:
+                if mode != self.forest_mode:
+                    _, _, forest_modes[mode] = self._fit_and_measure(
+                        mode, X_train, y_train, X_test, y_test, target_columns
+                    )
 
         model_path = self.output_dir / "business_impact_model.pkl"
         joblib.dump(estimator, model_path)
 
+        compiled = CompiledForest.from_estimator(estimator)
+        compiled_predictions = compiled.predict(X_test)
+        compiled_parity = float(np.max(np.abs(compiled_predictions - predictions)))
+        if not np.allclose(compiled_predictions, predictions, rtol=1e-9, atol=1e-6):
+            raise RuntimeError(f"Compiled forest diverges from sklearn predictions (max abs error {compiled_parity})")
+        compiled_model_path = self.output_dir / COMPILED_MODEL_FILENAME
+        compiled.save(compiled_model_path)
+
+        serving_bundle_path = self.output_dir / SERVING_BUNDLE_FILENAME
+        bundle = ServingBundle.build(compiled, feature_columns, target_columns, repository._metrics)
+        bundle.save(serving_bundle_path)
+
         feature_columns_path = self.output_dir / "feature_columns.json"
         metadata_path = self.output_dir / "model_metadata.json"
-        dataset_export_path = self.dataset_output
 
         with feature_columns_path.open("w", encoding="utf-8") as fh:
             json.dump({
@@ -79,21 +133,75 @@ class ModelTrainer:
                 {
                     "r2": eval_stats["r2"],
                     "mae": eval_stats["mae"],
-                    "n_samples": len(training_frame),
+                    "n_samples": n_samples,
+                    "compiled_parity_max_abs_error": compiled_parity,
+                    "forest_mode": self.forest_mode,
+                    "forest_modes": forest_modes,
                 },
                 fh,
                 indent=2,
             )
 
-        training_frame.to_json(dataset_export_path, orient="records", indent=2)
-
         return TrainingArtifacts(
             model_path=model_path,
             feature_columns_path=feature_columns_path,
             metadata_path=metadata_path,
             dataset_export_path=dataset_export_path,
+            compiled_model_path=compiled_model_path,
+            serving_bundle_path=serving_bundle_path,
         )
 
+    def _build_estimator(self, mode: str):
+        forest = RandomForestRegressor(
+            n_estimators=300,
+            max_depth=18,
+            min_samples_split=4,
+            random_state=42,
+            n_jobs=-1,
+        )
+        return forest if mode == "joint" else MultiOutputRegressor(forest)
+
+    def _fit_and_measure(
+        self,
+        mode: str,
+        X_train: pd.DataFrame,
+        y_train: pd.DataFrame,
+        X_test: pd.DataFrame,
+        y_test: pd.DataFrame,
+        target_columns: list[str],
+    ) -> Tuple[Any, np.ndarray, Dict[str, Any]]:
+        """Fit one forest mode and record its cost and accuracy."""
+        estimator = self._build_estimator(mode)
+        started = time.perf_counter()
+        estimator.fit(X_train, y_train)
+        train_seconds = time.perf_counter() - started
+
+        predictions = estimator.predict(X_test)
+        compiled = CompiledForest.from_estimator(estimator)
+        pickled = io.BytesIO()
+        joblib.dump(estimator, pickled)
+        stats: Dict[str, Any] = {
+            "train_seconds": train_seconds,
+            "model_bytes": pickled.getbuffer().nbytes,
+            "compiled_bytes": int(sum(np.asarray(array).nbytes for array in compiled.to_arrays().values())),
+            "n_trees": compiled.n_trees,
+            "single_row_latency_ms": {
+                "sklearn": self._median_latency_ms(estimator.predict, X_test.iloc[:1]),
+                "compiled": self._median_latency_ms(compiled.predict, X_test.iloc[:1]),
+            },
+            **self._evaluate(y_test, predictions, target_columns),
+        }
+        return estimator, predictions, stats
+
+    @staticmethod
+    def _median_latency_ms(predict, X: pd.DataFrame) -> float:
+        timings = []
+        for _ in range(LATENCY_REPEATS):
+            started = time.perf_counter()
+            predict(X)
+            timings.append(time.perf_counter() - started)
+        return float(np.median(timings) * 1000.0)
+
     def _evaluate(
         self, y_true: pd.DataFrame, y_pred, target_columns: Tuple[str, ...] | list[str]
     ) -> Dict[str, Dict[str, float]]:
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import math
+from typing import Dict, List, Mapping
+
+import numpy as np
+
+from ml import config
+from ml.config import BUSINESS_TYPE_INFO
+from ml.data_loader import DatasetLoader, classify_business_types
+from ml.location_metrics import LocationMetrics
+from ml.utils.geo import bbox_overlap_area_km2, haversine_km, haversine_km_array, radius_bbox
+from ml.utils.spatial_index import PointGrid
+
+MIN_RADIUS_KM = 0.1
+MAX_RADIUS_KM = 10.0
+
+
+class PointMetricsIndex:
+    """Computes :class:`LocationMetrics` for any (lat, lon, radius) on demand.
+
+    Businesses, transit stops and road segment midpoints are indexed once in
+    uniform grids, so a query only touches the points near the pin. The ACS
+    extract has tract ids but no tract geometry, so demographics are
+    area-weighted from the profiles (each standing in for its tracts) that the
+    query circle's bounding box overlaps, falling back to the nearest profile.
+    """
+
+    def __init__(self, loader: DatasetLoader, location_metrics: Mapping[str, LocationMetrics]):
+        self.location_metrics = location_metrics
+        self.profiles = [
+            profile for profile in config.LOCATION_PROFILES if profile.key in location_metrics
+        ]
+
+        business_df = loader.business_df
+        self.business_index = PointGrid.from_frame(business_df)
+        if business_df.empty:
+            self.business_type_codes = np.empty(0, dtype=np.int8)
+        elif "business_type" in business_df.columns:
+            self.business_type_codes = business_df["business_type"].cat.codes.to_numpy()
+        else:
+            self.business_type_codes = classify_business_types(business_df["category"]).codes
+        self.existing_index = PointGrid.from_frame(loader.existing_business_df)
+        self.transit_index = PointGrid.from_frame(loader.transit_df, "stop_lat", "stop_lon")
+
+        roads = loader.road_segments
+        lat1, lon1, lat2, lon2 = (np.asarray(roads[key]) for key in ("lat1", "lon1", "lat2", "lon2"))
+        self.road_index = PointGrid((lat1 + lat2) / 2, (lon1 + lon2) / 2)
+        self.road_lengths = haversine_km_array(lat1, lon1, lat2, lon2)
+
+    def metrics_for(self, lat: float, lon: float, radius_km: float = 1.0) -> LocationMetrics:
+        if not MIN_RADIUS_KM <= radius_km <= MAX_RADIUS_KM:
+            raise ValueError(f"radius_km must be between {MIN_RADIUS_KM} and {MAX_RADIUS_KM}")
+        area = math.pi * radius_km**2
+        demographics = self._weighted_demographics(lat, lon, radius_km)
+
+        type_names = list(BUSINESS_TYPE_INFO)
+        codes = self.business_type_codes[self.business_index.query_radius(lat, lon, radius_km)]
+        type_counts = np.bincount(codes[codes >= 0], minlength=len(type_names))
+
+        # Segments are attributed by midpoint, which is accurate for segments far shorter than the radius.
+        road_km = float(self.road_lengths[self.road_index.query_radius(lat, lon, radius_km)].sum())
+        stops = self.transit_index.query_radius(lat, lon, radius_km).size
+
+        return LocationMetrics(
+            population=demographics["population_density"] * area,
+            population_density=demographics["population_density"],
+            median_income=demographics["median_income"],
+            unemployment_rate=demographics["unemployment_rate"],
+            existing_business_count=float(self.existing_index.query_radius(lat, lon, radius_km).size),
+            business_type_counts={name: int(count) for name, count in zip(type_names, type_counts)},
+            road_density=road_km / area,
+            transit_score=min(stops / area * 10, config.TRANSIT_SCORE_SCALE),
+            area_km2=area,
+        )
+
+    def _weighted_demographics(self, lat: float, lon: float, radius_km: float) -> Dict[str, float]:
+        query_box = radius_bbox(lat, lon, radius_km)
+        weights: List[float] = []
+        metrics: List[LocationMetrics] = []
+        for profile in self.profiles:
+            overlap = bbox_overlap_area_km2(query_box, profile.bounding_box)
+            if overlap > 0:
+                weights.append(overlap)
+                metrics.append(self.location_metrics[profile.key])
+        if not weights:
+            nearest = min(self.profiles, key=lambda profile: self._center_distance(profile, lat, lon))
+            weights = [1.0]
+            metrics = [self.location_metrics[nearest.key]]
+
+        # Weight density by overlap area and income/unemployment by the people in that overlap.
+        density = sum(w * m.population_density for w, m in zip(weights, metrics)) / sum(weights)
+        people = [w * m.population_density for w, m in zip(weights, metrics)]
+        if not any(people):
+            people = weights
+        total_people = sum(people)
+        return {
+            "population_density": float(density),
+            "median_income": float(sum(p * m.median_income for p, m in zip(people, metrics)) / total_people),
+            "unemployment_rate": float(
+                sum(p * m.unemployment_rate for p, m in zip(people, metrics)) / total_people
+            ),
+        }
+
+    @staticmethod
+    def _center_distance(profile, lat: float, lon: float) -> float:
+        bbox = profile.bounding_box
+        return haversine_km(lat, lon, (bbox.min_lat + bbox.max_lat) / 2, (bbox.min_lon + bbox.max_lon) / 2)
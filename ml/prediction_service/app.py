@@ -1,16 +1,229 @@
 from __future__ import annotations
 
+import hmac
+import ipaddress
 import os
-from typing import Literal
+import threading
+import time
+import warnings
+from pathlib import Path
+from typing import Annotated, Any, Dict, List, Literal
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field
+import numpy as np
 
-from ml.prediction_service.predictor import PredictionPipeline
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, Field, ValidationError, model_validator
+from starlette.concurrency import run_in_threadpool
+
+from ml import config
+from ml.prediction_service import metrics
+from ml.prediction_service.batching import MicroBatcher
+from ml.prediction_service.predictor import RANK_TARGETS, PredictionPipeline, artifact_paths
+from ml.prediction_service.profiling import PROFILE_SCOPES, PROFILE_SORT_KEYS, RequestProfiler
+from ml.prediction_service.registry import ModelRegistry
+from ml.prediction_service.reloading import ModelWatcher
+
+_IMPORTED_AT = time.perf_counter()
 
 app = FastAPI(title="Business Impact Prediction Service")
-pipeline = PredictionPipeline()
 
+# PREDICTION_PROFILE_RATE is the fraction of /predict calls run under cProfile; 0 (the default) is off.
+profiler = RequestProfiler(float(os.environ.get("PREDICTION_PROFILE_RATE", "0")))
+
+
+class PipelineState:
+    """Holds the prediction pipeline and whether it has finished loading.
+
+    ``eager`` startup builds the pipeline before the server accepts traffic.
+    ``background`` lets uvicorn accept traffic immediately and builds it on a
+    worker thread; until then ``/health`` answers 503 and predictions are
+    refused. Either way loading happens per worker at startup, not at import,
+    so a multi-worker parent process never loads the model itself.
+
+    :meth:`reload` swaps in a freshly built pipeline without a restart.
+    """
+
+    def __init__(self) -> None:
+        self.pipeline: PredictionPipeline | None = None
+        self.error: str | None = None
+        self.load_seconds: float | None = None
+        self.generation = 0
+        self.last_reload: Dict[str, Any] | None = None
+        self.watcher: ModelWatcher | None = None
+        # Held by the startup load as well as by reloads, so a late initial load cannot replace a newer model.
+        self._reload_lock = threading.Lock()
+
+    def load(self) -> None:
+        started = time.perf_counter()
+        with self._reload_lock:
+            try:
+                self.pipeline = self._profiled_build()
+                self.generation += 1
+            except Exception as exc:
+                self.error = f"{type(exc).__name__}: {exc}"
+                raise
+            finally:
+                self.load_seconds = time.perf_counter() - started
+                metrics.MODEL_LOAD_SECONDS.set(self.load_seconds)
+        metrics.STARTUP_SECONDS.set(time.perf_counter() - _IMPORTED_AT)
+
+    def reload(self) -> bool:
+        """Build a new pipeline beside the live one, smoke-test it, then swap it in.
+
+        Building and warming happen off the request path. The swap is one
+        reference assignment: requests that already fetched the old pipeline
+        finish on it and it is freed once they are done. If the build or the
+        smoke prediction fails, the live pipeline keeps serving. Only one load
+        or reload runs at a time; a call made meanwhile returns False without
+        doing anything. After a successful swap the watcher, if any, treats
+        the files it was built from as served, so it does not load them again.
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        started = time.perf_counter()
+        try:
+            served = self.watcher.signature() if self.watcher is not None else None
+            candidate = self._profiled_build()
+            candidate.smoke_test()
+        except Exception as exc:
+            metrics.MODEL_RELOADS_TOTAL.inc(result="failure")
+            self.last_reload = {
+                "ok": False,
+                "error": f"{type(exc).__name__}: {exc}",
+                "seconds": time.perf_counter() - started,
+            }
+        else:
+            self.pipeline = candidate
+            self.error = None
+            self.generation += 1
+            self.load_seconds = time.perf_counter() - started
+            metrics.MODEL_LOAD_SECONDS.set(self.load_seconds)
+            metrics.MODEL_RELOADS_TOTAL.inc(result="success")
+            self.last_reload = {"ok": True, "error": None, "seconds": self.load_seconds}
+            if self.watcher is not None:
+                self.watcher.mark_current(served)
+        finally:
+            self._reload_lock.release()
+        return True
+
+    def start_reload(self) -> bool:
+        """Run :meth:`reload` on a background thread; False if one is already running."""
+        if self._reload_lock.locked():
+            return False
+        threading.Thread(target=self.reload, name="pipeline-reloader", daemon=True).start()
+        return True
+
+    def reload_status(self) -> Dict[str, Any]:
+        return {
+            "generation": self.generation,
+            "reloading": self._reload_lock.locked(),
+            "last_reload": self.last_reload,
+        }
+
+    def _profiled_build(self) -> PredictionPipeline:
+        # Construction is rare, so it is profiled whenever profiling is on at all.
+        if profiler.rate > 0:
+            return profiler.call("load", self._build)
+        return self._build()
+
+    @staticmethod
+    def _build(models_dir: Path | None = None, source: str | None = None) -> PredictionPipeline:
+        return PredictionPipeline(
+            models_dir=models_dir,
+            cache_mode=os.environ.get("PREDICTION_CACHE_MODE", "off"),
+            cache_size=int(os.environ.get("PREDICTION_CACHE_SIZE", "256")),
+            model_engine=os.environ.get("PREDICTION_MODEL_ENGINE", "sklearn"),
+            source=source or os.environ.get("PREDICTION_MODEL_SOURCE", "artifacts"),
+            mmap_model=os.environ.get("PREDICTION_MMAP_MODEL", "0") == "1",
+        )
+
+    def get(self) -> PredictionPipeline:
+        if self.pipeline is None:
+            detail = f"Model failed to load: {self.error}" if self.error else "Model is still loading"
+            raise HTTPException(status_code=503, detail=detail)
+        return self.pipeline
+
+
+state = PipelineState()
+
+# PREDICTION_RELOAD_POLL_SECONDS > 0 watches the model files and hot-reloads when a new set lands.
+_reload_poll_seconds = float(os.environ.get("PREDICTION_RELOAD_POLL_SECONDS", "0"))
+watcher = (
+    ModelWatcher(
+        lambda: artifact_paths(source=os.environ.get("PREDICTION_MODEL_SOURCE", "artifacts")),
+        state.reload,
+        interval_seconds=_reload_poll_seconds,
+    )
+    if _reload_poll_seconds > 0
+    else None
+)
+state.watcher = watcher
+
+
+def _load_named_model(path: Path) -> PredictionPipeline:
+    # Named models always serve their bundle: it carries the location metrics the model was trained
+    # on, whereas the artifacts source would rebuild metrics from the service's own datasets.
+    model_id = path.relative_to(registry.root).as_posix()
+    try:
+        pipeline = PipelineState._build(path, source="bundle")
+    except FileNotFoundError as exc:
+        # Report the id the client sent; the message of ``exc`` names the server-side path.
+        raise KeyError(f"Model {model_id} has no serving bundle") from exc
+    pipeline.on_resize = lambda: registry.resize(model_id)
+    return pipeline
+
+
+# Requests naming a ``model`` are served from that subdirectory of PREDICTION_MODELS_ROOT; those
+# pipelines load on first use and the least recently used are dropped past PREDICTION_MODEL_MEMORY_MB.
+registry: ModelRegistry[PredictionPipeline] = ModelRegistry(
+    Path(os.environ.get("PREDICTION_MODELS_ROOT", str(config.MODELS_DIR))),
+    loader=_load_named_model,
+    sizer=lambda pipeline: pipeline.resident_bytes(),
+    memory_budget_bytes=int(float(os.environ.get("PREDICTION_MODEL_MEMORY_MB", "1024")) * 2**20),
+)
+
+
+def pipeline_for(model: str | None) -> PredictionPipeline:
+    """The default pipeline, or the registry's pipeline for ``model``."""
+    return state.get() if model is None else registry.get(model)
+
+
+def _predict_many(payloads: List[dict]) -> List[dict]:
+    """Score payloads that may name different models, one ``predict_many`` call per model."""
+    groups: Dict[str | None, List[int]] = {}
+    for idx, payload in enumerate(payloads):
+        groups.setdefault(payload.get("model"), []).append(idx)
+    if len(groups) == 1:
+        return pipeline_for(next(iter(groups))).predict_many(payloads)
+    results: List[dict] = [{}] * len(payloads)
+    for model, indices in groups.items():
+        for idx, result in zip(indices, pipeline_for(model).predict_many([payloads[idx] for idx in indices])):
+            results[idx] = result
+    return results
+
+
+@app.on_event("startup")
+def _load_pipeline() -> None:
+    if watcher is not None:
+        watcher.start()
+    if os.environ.get("PREDICTION_STARTUP", "eager") == "background":
+        threading.Thread(target=state.load, name="pipeline-loader", daemon=True).start()
+    else:
+        state.load()
+
+
+# A window of 0 ms (the default) keeps one model call per /predict request.
+_batch_window_ms = float(os.environ.get("PREDICTION_BATCH_WINDOW_MS", "0"))
+batcher = (
+    MicroBatcher(
+        lambda payloads: profiler.maybe_call("predict", _predict_many, payloads),
+        max_batch_size=int(os.environ.get("PREDICTION_MAX_BATCH_SIZE", "32")),
+        max_wait_ms=_batch_window_ms,
+    )
+    if _batch_window_ms > 0
+    else None
+)
 
 BusinessTypeLiteral = Literal["grocery", "restaurant", "retail", "service", "healthcare", "entertainment"]
 BusinessScaleLiteral = Literal["small", "medium", "large"]
@@ -23,17 +236,37 @@ class ContextSignals(BaseModel):
     confidence: float = Field(1.0, ge=0.6, le=1.2)
 
 
+class UncertaintyOptions(BaseModel):
+    level: float = Field(0.9, gt=0.0, lt=1.0)
+    quantiles: List[Annotated[float, Field(ge=0.0, le=1.0)]] = Field(default_factory=list, max_length=20)
+
+
 class PredictionRequest(BaseModel):
     business_type: BusinessTypeLiteral = Field(..., alias="businessType")
     scale: BusinessScaleLiteral
-    location_key: str = Field(..., alias="locationKey", min_length=3)
+    location_key: str | None = Field(default=None, alias="locationKey", min_length=3)
     location_label: str | None = Field(default=None, alias="locationLabel")
+    latitude: float | None = Field(default=None, ge=-90, le=90)
+    longitude: float | None = Field(default=None, ge=-180, le=180)
+    radius_km: float | None = Field(default=None, alias="radiusKm", ge=0.1, le=10.0)
     context_signals: ContextSignals | None = Field(default=None, alias="contextSignals")
+    uncertainty: UncertaintyOptions | None = None
+    model: str | None = Field(default=None, min_length=1, max_length=128)
     query: str | None = None
 
     class Config:
         populate_by_name = True
 
+    @model_validator(mode="after")
+    def require_location(self) -> "PredictionRequest":
+        has_point = self.latitude is not None and self.longitude is not None
+        if not has_point and self.location_key is None:
+            raise ValueError("Provide either locationKey or latitude and longitude")
+        # The pin would be scored but the response labelled with the profile; make the caller pick one.
+        if self.location_key is not None and (self.latitude is not None or self.longitude is not None):
+            raise ValueError("Provide either locationKey or latitude and longitude, not both")
+        return self
+
 
 class PredictionResponse(BaseModel):
     wages: float
@@ -49,38 +282,319 @@ class PredictionResponse(BaseModel):
     context_applied: bool
     location_key: str
     location_label: str | None
+    uncertainty: dict | None = None
+    model: str | None = None
 
 
 @app.get("/health")
-def health() -> dict:
-    return {"status": "ok"}
+def health() -> JSONResponse:
+    if state.pipeline is None:
+        status = "error" if state.error else "loading"
+        return JSONResponse({"status": status, "ready": False, "error": state.error}, status_code=503)
+    return JSONResponse(
+        {
+            "status": "ok",
+            "ready": True,
+            "source": state.pipeline.source,
+            "load_seconds": state.load_seconds,
+            "generation": state.generation,
+        }
+    )
 
 
-@app.post("/predict", response_model=PredictionResponse)
-def predict(request: PredictionRequest) -> PredictionResponse:
+@app.get("/locations/metrics")
+def location_metrics(
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(1.0, alias="radiusKm", ge=0.1, le=10.0),
+) -> dict:
+    return state.get().point_metrics(latitude, longitude, radius_km).to_json()
+
+
+@app.get("/cache/stats")
+def cache_stats() -> dict:
+    return state.get().cache_stats()
+
+
+@app.get("/metrics")
+def prometheus_metrics() -> Response:
+    # Counters are per process; with several workers each scrape sees the worker that answered it.
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@app.get("/batching/stats")
+def batching_stats() -> dict:
+    if batcher is None:
+        return {"enabled": False}
+    return batcher.stats()
+
+
+def _is_loopback(host: str | None) -> bool:
     try:
-        context_dict = request.context_signals.model_dump(by_alias=True) if request.context_signals else {}
-        result = pipeline.predict(
-            {
-                "business_type": request.business_type,
-                "scale": request.scale,
-                "location_key": request.location_key,
-                "context_signals": context_dict,
-                "query": request.query,
-            }
+        return host is not None and ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def require_admin(request: Request, x_admin_token: str | None = Header(default=None)) -> None:
+    """With PREDICTION_ADMIN_TOKEN set the X-Admin-Token header must match; without it only loopback clients pass.
+
+    Admin routes reload and evict models, so they are never open to the network by default.
+    """
+    expected = os.environ.get("PREDICTION_ADMIN_TOKEN")
+    if expected:
+        if x_admin_token is None or not hmac.compare_digest(x_admin_token, expected):
+            raise HTTPException(status_code=403, detail="Invalid admin token")
+    elif not _is_loopback(request.client.host if request.client else None):
+        raise HTTPException(
+            status_code=403, detail="Admin routes are limited to localhost unless PREDICTION_ADMIN_TOKEN is set"
         )
+
+
+@app.get("/admin/profiling", dependencies=[Depends(require_admin)])
+def profiling_status() -> dict:
+    return profiler.status()
+
+
+@app.post("/admin/profiling", dependencies=[Depends(require_admin)])
+def configure_profiling(rate: float = Query(..., ge=0.0, le=1.0), reset: bool = False) -> dict:
+    profiler.set_rate(rate)
+    if reset:
+        profiler.reset()
+    return profiler.status()
+
+
+@app.delete("/admin/profiling", dependencies=[Depends(require_admin)])
+def reset_profiling() -> dict:
+    profiler.reset()
+    return profiler.status()
+
+
+@app.get("/admin/profiling/report", dependencies=[Depends(require_admin)])
+def profiling_report(
+    scope: Literal[PROFILE_SCOPES] = "predict",
+    sort: Literal[PROFILE_SORT_KEYS] = "cumulative",
+    limit: int = Query(40, ge=1, le=500),
+) -> Response:
+    return Response(profiler.report(scope, sort, limit), media_type="text/plain")
+
+
+@app.get("/admin/profiling/stats", dependencies=[Depends(require_admin)])
+def profiling_stats(scope: Literal[PROFILE_SCOPES] = "predict") -> Response:
+    """Aggregated stats as a pstats file: ``python -m pstats predict.prof`` or snakeviz."""
+    try:
+        payload = profiler.dump(scope)
     except KeyError as exc:
-        raise HTTPException(status_code=400, detail=str(exc)) from exc
+        raise HTTPException(status_code=404, detail=str(exc.args[0])) from exc
+    return Response(
+        payload,
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="{scope}.prof"'},
+    )
+
+
+MAX_SWEEP_SCENARIOS = 100_000
+
+
+class SweepRange(BaseModel):
+    start: float
+    stop: float
+    steps: int = Field(..., ge=1, le=1000)
+
+    def values(self) -> List[float]:
+        return np.linspace(self.start, self.stop, self.steps).tolist()
+
+
+class SweepRequest(PredictionRequest):
+    """A scenario plus the context signal values to sweep, as explicit lists or evenly spaced ranges."""
+
+    grid: Dict[Literal["demandBoost", "spendPremium", "wagePremium", "confidence"], List[float] | SweepRange] = Field(
+        ..., min_length=1
+    )
+
+    @model_validator(mode="after")
+    def check_grid(self) -> "SweepRequest":
+        size = 1
+        for name, axis in self.grid.items():
+            values = axis.values() if isinstance(axis, SweepRange) else axis
+            if not values:
+                raise ValueError(f"Sweep axis {name} is empty")
+            # Swept values obey the same bounds as a single request's contextSignals.
+            try:
+                ContextSignals(**{name: min(values)})
+                ContextSignals(**{name: max(values)})
+            except ValidationError as exc:
+                raise ValueError(f"Sweep axis {name} is out of range: {exc.errors()[0]['msg']}") from exc
+            size *= len(values)
+        if size > MAX_SWEEP_SCENARIOS:
+            raise ValueError(f"Sweep has {size} scenarios; the limit is {MAX_SWEEP_SCENARIOS}")
+        return self
+
+    def signal_values(self) -> Dict[str, List[float]]:
+        return {
+            name: axis.values() if isinstance(axis, SweepRange) else list(axis) for name, axis in self.grid.items()
+        }
+
+
+class BatchPredictionRequest(BaseModel):
+    items: List[PredictionRequest] = Field(..., min_length=1, max_length=500)
+
+
+class BatchPredictionResponse(BaseModel):
+    results: List[PredictionResponse]
+
+
+def _to_pipeline_payload(request: PredictionRequest) -> dict:
+    context_dict = request.context_signals.model_dump(by_alias=True) if request.context_signals else {}
+    return {
+        "business_type": request.business_type,
+        "scale": request.scale,
+        "location_key": request.location_key,
+        "latitude": request.latitude,
+        "longitude": request.longitude,
+        "radius_km": request.radius_km,
+        "context_signals": context_dict,
+        "uncertainty": request.uncertainty.model_dump() if request.uncertainty else None,
+        "model": request.model,
+        "query": request.query,
+    }
+
+
+def _to_response(request: PredictionRequest, result: dict) -> PredictionResponse:
     # Ensure no duplicate location fields
-    result.pop("location_key", None)
+    resolved_key = result.pop("location_key", None)
     result.pop("location_label", None)
-    return PredictionResponse(
-        **result,
-        location_key=request.location_key,
-        location_label=request.location_label,
+    with metrics.STAGE_SECONDS.time(stage="response_validation"):
+        return PredictionResponse(
+            **result,
+            location_key=request.location_key or resolved_key,
+            location_label=request.location_label,
+            model=request.model,
+        )
+
+
+@app.post("/predict", response_model=PredictionResponse)
+async def predict(request: PredictionRequest) -> PredictionResponse:
+    with metrics.REQUEST_SECONDS.time(endpoint="predict"):
+        return await _predict(request)
+
+
+async def _predict(request: PredictionRequest) -> PredictionResponse:
+    payload = _to_pipeline_payload(request)
+    try:
+        if batcher is not None:
+            result = await batcher.submit(payload)
+        else:
+            results = await run_in_threadpool(profiler.maybe_call, "predict", _predict_many, [payload])
+            result = results[0]
+    except (KeyError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return _to_response(request, result)
+
+
+@app.post("/predict/batch", response_model=BatchPredictionResponse)
+def predict_batch(request: BatchPredictionRequest) -> BatchPredictionResponse:
+    with metrics.REQUEST_SECONDS.time(endpoint="predict_batch"):
+        return _predict_batch(request)
+
+
+def _predict_batch(request: BatchPredictionRequest) -> BatchPredictionResponse:
+    try:
+        payloads = [_to_pipeline_payload(item) for item in request.items]
+        results = profiler.maybe_call("predict", _predict_many, payloads)
+    except (KeyError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return BatchPredictionResponse(
+        results=[_to_response(item, result) for item, result in zip(request.items, results)]
     )
 
 
+@app.get("/models")
+def models() -> dict:
+    """Registry residency, load and eviction counts; the default model is always resident."""
+    return registry.stats()
+
+
+@app.delete("/admin/models/{model_id:path}", dependencies=[Depends(require_admin)])
+def evict_model(model_id: str) -> dict:
+    if not registry.evict(model_id):
+        raise HTTPException(status_code=404, detail=f"Model {model_id} is not loaded")
+    return registry.stats()
+
+
+@app.get("/admin/reload", dependencies=[Depends(require_admin)])
+def reload_status() -> dict:
+    return state.reload_status()
+
+
+@app.post("/admin/reload", dependencies=[Depends(require_admin)])
+async def reload_model(wait: bool = False) -> JSONResponse:
+    """Hot-reload the model files from disk; ``wait=true`` returns once the swap (or failure) is done."""
+    if wait:
+        if not await run_in_threadpool(state.reload):
+            return JSONResponse({**state.reload_status(), "started": False}, status_code=409)
+        status = state.reload_status()
+        ok = status["last_reload"] is not None and status["last_reload"]["ok"]
+        return JSONResponse(status, status_code=200 if ok else 500)
+    started = state.start_reload()
+    return JSONResponse({**state.reload_status(), "started": started}, status_code=202 if started else 409)
+
+
+class RankRequest(BaseModel):
+    business_type: BusinessTypeLiteral = Field(..., alias="businessType")
+    target: Literal[RANK_TARGETS] = "local_spending"
+    k: int = Field(5, ge=1, le=1000)
+    scales: List[BusinessScaleLiteral] | None = Field(default=None, min_length=1)
+    context_signals: ContextSignals | None = Field(default=None, alias="contextSignals")
+    model: str | None = Field(default=None, min_length=1, max_length=128)
+
+    class Config:
+        populate_by_name = True
+
+
+@app.post("/predict/rank")
+def predict_rank(request: RankRequest) -> dict:
+    """Best location profiles for a business type, each at its best scale (of ``scales``, default all)."""
+    context = request.context_signals.model_dump(by_alias=True) if request.context_signals else {}
+    with metrics.REQUEST_SECONDS.time(endpoint="predict_rank"):
+        try:
+            ranking = profiler.maybe_call(
+                "predict",
+                pipeline_for(request.model).rank,
+                request.business_type,
+                request.target,
+                request.k,
+                request.scales,
+                context,
+            )
+        except (KeyError, ValueError) as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return {
+        "business_type": request.business_type,
+        "target": request.target,
+        "model": request.model,
+        "results": ranking,
+    }
+
+
+@app.post("/predict/sweep")
+def predict_sweep(request: SweepRequest) -> JSONResponse:
+    """One model call, then every context-signal combination as rows of ``values`` (last axis fastest)."""
+    with metrics.REQUEST_SECONDS.time(endpoint="predict_sweep"):
+        try:
+            result = profiler.maybe_call(
+                "predict", pipeline_for(request.model).sweep, _to_pipeline_payload(request), request.signal_values()
+            )
+        except (KeyError, ValueError) as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        result["values"] = result["values"].tolist()
+        result["location_key"] = request.location_key or result["location_key"]
+        result["location_label"] = request.location_label
+        result["model"] = request.model
+        # Plain floats only, so skip FastAPI's recursive encoder on what can be a large matrix.
+        return JSONResponse(result)
+
+
 def run() -> None:
     import uvicorn
 
@@ -88,5 +602,39 @@ def run() -> None:
     uvicorn.run(app, host="0.0.0.0", port=port)
 
 
+def run_workers(workers: int | None = None) -> None:
+    """Serve with several worker processes sharing one memory-mapped model.
+
+    Each worker loads the pipeline at startup; with the compiled forest or the
+    serving bundle memory-mapped, the model arrays live once in the page cache
+    instead of once per worker. Unless configured otherwise, workers here serve
+    the bundle memory-mapped; a pickled sklearn model cannot be shared, so
+    choosing one warns.
+    """
+    import uvicorn
+
+    port = int(os.environ.get("PORT", "9000"))
+    workers = workers or int(os.environ.get("PREDICTION_WORKERS", str(os.cpu_count() or 1)))
+    if "PREDICTION_MODEL_ENGINE" not in os.environ:
+        # An explicit engine choice stands; the bundle would serve the compiled forest regardless.
+        os.environ.setdefault("PREDICTION_MODEL_SOURCE", "bundle")
+    os.environ.setdefault("PREDICTION_MMAP_MODEL", "1")
+    shareable = (
+        os.environ.get("PREDICTION_MODEL_SOURCE") == "bundle"
+        or os.environ.get("PREDICTION_MODEL_ENGINE") == "compiled"
+    )
+    if workers > 1 and not (shareable and os.environ["PREDICTION_MMAP_MODEL"] == "1"):
+        warnings.warn(
+            f"{workers} workers will each load a private copy of the model; set PREDICTION_MODEL_SOURCE=bundle "
+            "or PREDICTION_MODEL_ENGINE=compiled with PREDICTION_MMAP_MODEL=1 to share one",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+    uvicorn.run("ml.prediction_service.app:app", host="0.0.0.0", port=port, workers=workers)
+
+
 if __name__ == "__main__":
-    run()
+    if int(os.environ.get("PREDICTION_WORKERS", "1")) > 1:
+        run_workers()
+    else:
+        run()
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+STATS_WINDOW = 2048
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-item calls into batched handler calls.
+
+    Items submitted within ``max_wait_ms`` of the first queued item (or until
+    ``max_batch_size`` items are waiting) are passed to ``handler`` together on
+    a worker thread, and each caller receives its own result. If a batch
+    raises, items are retried one by one so a bad request only fails itself.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Sequence[Any]], List[Any]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 2.0,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: asyncio.Queue[Tuple[Any, asyncio.Future, float]] | None = None
+        self._worker: asyncio.Task | None = None
+        self.batches = 0
+        self.items = 0
+        self._batch_sizes: Deque[int] = deque(maxlen=STATS_WINDOW)
+        self._queue_waits: Deque[float] = deque(maxlen=STATS_WINDOW)
+
+    async def submit(self, item: Any) -> Any:
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future, time.perf_counter()))
+        return await future
+
+    def _ensure_worker(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._dispatch(batch)
+
+    async def _dispatch(self, batch: List[Tuple[Any, asyncio.Future, float]]) -> None:
+        started = time.perf_counter()
+        self.batches += 1
+        self.items += len(batch)
+        self._batch_sizes.append(len(batch))
+        self._queue_waits.extend(started - enqueued for _, _, enqueued in batch)
+
+        items = [item for item, _, _ in batch]
+        try:
+            results = await asyncio.to_thread(self.handler, items)
+        except Exception as exc:
+            if len(batch) == 1:
+                self._resolve(batch[0][1], error=exc)
+            else:
+                await asyncio.gather(*(self._dispatch_single(entry) for entry in batch))
+            return
+        for (_, future, _), result in zip(batch, results):
+            self._resolve(future, result=result)
+
+    async def _dispatch_single(self, entry: Tuple[Any, asyncio.Future, float]) -> None:
+        item, future, _ = entry
+        try:
+            result = (await asyncio.to_thread(self.handler, [item]))[0]
+        except Exception as exc:
+            self._resolve(future, error=exc)
+            return
+        self._resolve(future, result=result)
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, result: Any = None, error: BaseException | None = None) -> None:
+        # The caller may have gone away (request cancelled) while the batch ran.
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        sizes = np.asarray(self._batch_sizes, dtype=np.float64)
+        waits_ms = np.asarray(self._queue_waits, dtype=np.float64) * 1000.0
+
+        def percentile(values: np.ndarray, q: float) -> float:
+            return float(np.percentile(values, q)) if values.size else 0.0
+
+        return {
+            "enabled": True,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "batches": self.batches,
+            "items": self.items,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "batch_size": {
+                "mean": float(sizes.mean()) if sizes.size else 0.0,
+                "p50": percentile(sizes, 50),
+                "max": float(sizes.max()) if sizes.size else 0.0,
+            },
+            "queue_wait_ms": {
+                "mean": float(waits_ms.mean()) if waits_ms.size else 0.0,
+                "p50": percentile(waits_ms, 50),
+                "p99": percentile(waits_ms, 99),
+            },
+        }
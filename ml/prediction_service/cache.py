@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+import numpy as np
+
+CACHE_MODES = ("off", "lazy", "grid")
+
+
+class BasePredictionCache:
+    """Thread-safe LRU store of raw model outputs keyed by request inputs.
+
+    With ``maxsize=None`` the cache is unbounded, which is what the ``grid``
+    mode uses after precomputing every (location, business type, scale) row.
+    """
+
+    def __init__(self, mode: str = "lazy", maxsize: Optional[int] = 256):
+        if mode not in CACHE_MODES or mode == "off":
+            raise ValueError(f"Unsupported cache mode: {mode}")
+        self.mode = mode
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        with self._lock:
+            row = self._entries.get(key)
+            if row is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return row
+
+    def put(self, key: Hashable, row: np.ndarray) -> None:
+        with self._lock:
+            self._entries[key] = row
+            self._entries.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "mode": self.mode,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
@@ -1,34 +1,184 @@
 from __future__ import annotations
 
 import json
+import threading
 from pathlib import Path
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Sequence
 
-import joblib
-import pandas as pd
+import numpy as np
 
 from ml import config
-from ml.data_loader import DatasetLoader
-from ml.feature_engineering import FeatureEngineer, LocationFeatureRepository
+from ml.compiled_forest import COMPILED_MODEL_FILENAME, CompiledForest
+from ml.location_metrics import LocationMetrics, build_feature_vector
+from ml.prediction_service.cache import BasePredictionCache
+from ml.prediction_service.metrics import PREDICTIONS_TOTAL, STAGE_SECONDS
+from ml.serving_bundle import SERVING_BUNDLE_FILENAME, ServingBundle, compute_benchmarks
+
+if TYPE_CHECKING:
+    from ml.data_loader import DatasetLoader
+
+DEFAULT_POINT_RADIUS_KM = 1.0
+# Pins are rounded to ~1 m so repeated drops on the same spot share cache entries.
+POINT_PRECISION = 5
+MODEL_SOURCES = ("artifacts", "bundle")
+# Context signals and the range each is clamped to before it scales the model output.
+CONTEXT_SIGNAL_BOUNDS = {
+    "demandBoost": (0.6, 1.8),
+    "spendPremium": (0.65, 1.6),
+    "wagePremium": (0.65, 1.45),
+    "confidence": (0.7, 1.15),
+}
+JOBS_MULTIPLIER_BOUNDS = (0.7, 1.6)
+PAYROLL_SHARE_BOUNDS = (0.28, 0.58)
+SWEEP_COLUMNS = ("wages", "foot_traffic", "local_spending", "sales_tax", "confidence", "jobs_created")
+RANK_TARGETS = ("wages", "foot_traffic", "local_spending", "sales_tax", "jobs_created")
+# Outputs that carry model uncertainty; jobs_created and confidence do not depend on the forest.
+UNCERTAINTY_COLUMNS = ("wages", "foot_traffic", "local_spending", "sales_tax")
+DEFAULT_INTERVAL_LEVEL = 0.9
+
+
+def artifact_paths(models_dir: Path | None = None, source: str = "artifacts") -> List[Path]:
+    """Files a pipeline with this configuration is built from."""
+    models_dir = models_dir or config.MODELS_DIR
+    if source == "bundle":
+        return [models_dir / SERVING_BUNDLE_FILENAME]
+    return [
+        models_dir / "business_impact_model.pkl",
+        models_dir / COMPILED_MODEL_FILENAME,
+        models_dir / "feature_columns.json",
+        models_dir / "location_metrics.json",
+    ]
+
+
+def _forest_bytes(forest: CompiledForest) -> int:
+    return int(sum(array.nbytes for array in forest.to_arrays().values()))
 
 
 class PredictionPipeline:
-    """Loads the trained model and produces predictions for incoming requests."""
+    """Loads the trained model and produces predictions for incoming requests.
 
-    def __init__(self, models_dir: Path | None = None):
+    ``source="artifacts"`` rebuilds location metrics from the datasets and
+    loads the pickled model; ``source="bundle"`` reads the prebuilt
+    ``serving_bundle.npz`` written by the trainer and always serves the
+    compiled forest. The dataset and sklearn stacks are imported only when a
+    code path needs them, so the bundle path starts without them. With
+    ``mmap_model`` the compiled forest arrays are memory-mapped read-only, so
+    worker processes serving the same file share one copy. ``loader`` and
+    ``metrics_cache_path`` override the regional datasets and the metrics
+    cache the location metrics (and pins) are built from.
+    """
+
+    def __init__(
+        self,
+        models_dir: Path | None = None,
+        cache_mode: str = "off",
+        cache_size: int = 256,
+        model_engine: str = "sklearn",
+        source: str = "artifacts",
+        mmap_model: bool = False,
+        loader: DatasetLoader | None = None,
+        metrics_cache_path: Path | None = None,
+    ):
+        if source not in MODEL_SOURCES:
+            raise ValueError(f"Unsupported model source: {source}")
         self.models_dir = models_dir or config.MODELS_DIR
-        self.model = self._load_model()
+        self.source = source
+        self.mmap_model = mmap_model
+        self.loader = loader
+        if source == "bundle":
+            self._load_bundle()
+        else:
+            self._load_artifacts(model_engine, metrics_cache_path)
+        self._point_index = None
+        self._point_index_lock = threading.Lock()
+        self._tree_forest_cache: CompiledForest | None = None
+        self._tree_forest_lock = threading.Lock()
+        # Called after the pipeline grows in memory (the lazily compiled per-tree forest), e.g. by a model registry.
+        self.on_resize: Callable[[], None] | None = None
+        self.cache = self._init_cache(cache_mode, cache_size)
+        # The grid cache is unbounded and pins are not, so in grid mode they get an LRU of their own.
+        self.point_cache = BasePredictionCache(mode="lazy", maxsize=cache_size) if cache_mode == "grid" else None
+
+    def _load_bundle(self) -> None:
+        bundle_path = self.models_dir / SERVING_BUNDLE_FILENAME
+        if not bundle_path.exists():
+            raise FileNotFoundError(f"Serving bundle not found at {bundle_path}. Run train_model.py first.")
+        bundle = ServingBundle.load(bundle_path, mmap=self.mmap_model)
+        self.model = bundle.model
+        self.feature_columns = bundle.feature_columns
+        self.location_metrics = bundle.metrics
+        self.benchmarks = bundle.benchmarks
+        self._model_bytes = _forest_bytes(self.model)
+
+    def _load_artifacts(self, model_engine: str, metrics_cache_path: Path | None) -> None:
+        from ml.feature_engineering import LocationFeatureRepository
+
+        self.model = self._load_model(model_engine)
         self.feature_columns = self._load_feature_columns()
-        loader = DatasetLoader()
-        self.repository = LocationFeatureRepository(loader)
-        self.engineer = FeatureEngineer(self.repository)
-        self.benchmarks = self._compute_benchmarks()
+        repository = LocationFeatureRepository(
+            self._dataset_loader(), cache_path=metrics_cache_path or self.models_dir / "location_metrics.json"
+        )
+        self.location_metrics = repository._metrics
+        self.benchmarks = compute_benchmarks(self.location_metrics.values())
+
+    def resident_bytes(self) -> int:
+        """Estimated memory held by the model: array sizes for compiled forests, the pickle size for sklearn.
+
+        Both are measured when the model loads; the per-tree forest compiled later is added once it exists.
+        """
+        total = self._model_bytes
+        if self._tree_forest_cache is not None:
+            total += _forest_bytes(self._tree_forest_cache)
+        return total
+
+    def smoke_test(self) -> None:
+        """Score one known request and fail loudly if the outputs are not finite numbers."""
+        payload = {
+            "location_key": next(iter(self.location_metrics)),
+            "business_type": next(iter(config.BUSINESS_TYPE_INFO)),
+            "scale": next(iter(config.SCALE_FACTORS)),
+        }
+        result = self.predict(payload)
+        values = [result[column] for column in SWEEP_COLUMNS]
+        if not np.all(np.isfinite(values)):
+            raise ValueError(f"Smoke prediction returned non-finite outputs: {dict(zip(SWEEP_COLUMNS, values))}")
+
+    def _init_cache(self, mode: str, size: int) -> BasePredictionCache | None:
+        if mode == "off":
+            return None
+        if mode == "grid":
+            cache = BasePredictionCache(mode="grid", maxsize=None)
+            requests = [
+                self._normalize_payload({"location_key": key, "business_type": business_type, "scale": scale})
+                for key in self.location_metrics
+                for business_type in config.BUSINESS_TYPE_INFO
+                for scale in config.SCALE_FACTORS
+            ]
+            for req, row in zip(requests, self._run_model(requests)):
+                cache.put(self._cache_key(req), row)
+            return cache
+        return BasePredictionCache(mode=mode, maxsize=size)
+
+    def _load_model(self, engine: str):
+        if engine not in ("sklearn", "compiled"):
+            raise ValueError(f"Unsupported model engine: {engine}")
+        if engine == "compiled":
+            compiled_path = self.models_dir / COMPILED_MODEL_FILENAME
+            if compiled_path.exists():
+                model = CompiledForest.load(compiled_path, mmap=self.mmap_model)
+                self._model_bytes = _forest_bytes(model)
+                return model
+        import joblib
 
-    def _load_model(self):
         model_path = self.models_dir / "business_impact_model.pkl"
         if not model_path.exists():
             raise FileNotFoundError(f"Trained model not found at {model_path}. Run train_model.py first.")
-        return joblib.load(model_path)
+        self._model_bytes = model_path.stat().st_size
+        model = joblib.load(model_path)
+        if engine == "compiled":
+            model = CompiledForest.from_estimator(model)
+            self._model_bytes = _forest_bytes(model)
+        return model
 
     def _load_feature_columns(self) -> list[str]:
         metadata_path = self.models_dir / "feature_columns.json"
@@ -39,22 +189,317 @@ class PredictionPipeline:
         return payload["features"]
 
     def predict(self, payload: Dict[str, Any]) -> Dict[str, float]:
-        business_type = payload["business_type"].lower()
-        scale = payload["scale"].lower()
-        location_key = payload["location_key"].lower()
-        context_signals = payload.get("context_signals") or {}
+        return self.predict_many([payload])[0]
+
+    def predict_many(self, payloads: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Score a batch of requests with a single model call.
+
+        Payloads with an ``uncertainty`` entry (``{"level": 0.9, "quantiles":
+        [...]}``) are scored from every tree's output instead, in one pass
+        for all of them, and their results gain an ``uncertainty`` block.
+        """
+        if not payloads:
+            return []
+        with STAGE_SECONDS.time(stage="normalize"):
+            requests = [self._normalize_payload(payload) for payload in payloads]
+        uncertain = [idx for idx, req in enumerate(requests) if req["uncertainty"] is not None]
+        if uncertain:
+            predictions: List[Any] = [None] * len(requests)
+            plain = [idx for idx, req in enumerate(requests) if req["uncertainty"] is None]
+            if plain:
+                for idx, row in zip(plain, self._predict_base([requests[idx] for idx in plain])):
+                    predictions[idx] = row
+            samples = self._run_model_trees([requests[idx] for idx in uncertain])
+            # The tree mean is the forest prediction (equal to a plain request up to summation order).
+            for position, row in zip(uncertain, samples.sum(axis=0) / samples.shape[0]):
+                predictions[position] = row
+        else:
+            predictions = self._predict_base(requests)
+        with STAGE_SECONDS.time(stage="context_adjustment"):
+            results = [self._build_result(req, row) for req, row in zip(requests, predictions)]
+            if uncertain:
+                intervals = self._uncertainty([requests[idx] for idx in uncertain], samples)
+                for idx, block in zip(uncertain, intervals):
+                    results[idx]["uncertainty"] = block
+        for req in requests:
+            # Pins would give every request its own label; count them under one series.
+            location = "point" if req["location_key"].startswith("point:") else req["location_key"]
+            PREDICTIONS_TOTAL.inc(business_type=req["business_type"], location=location)
+        return results
+
+    def cache_stats(self) -> Dict[str, Any]:
+        if self.cache is None:
+            return {"mode": "off"}
+        stats = self.cache.stats()
+        if self.point_cache is not None:
+            stats["points"] = self.point_cache.stats()
+        return stats
+
+    def _predict_base(self, requests: List[Dict[str, Any]]):
+        if self.cache is None:
+            return self._run_model(requests)
+        keys = [self._cache_key(req) for req in requests]
+        caches = [self._cache_for(key) for key in keys]
+        rows = [cache.get(key) for cache, key in zip(caches, keys)]
+        missing = [idx for idx, row in enumerate(rows) if row is None]
+        if missing:
+            computed = self._run_model([requests[idx] for idx in missing])
+            for idx, row in zip(missing, computed):
+                rows[idx] = row
+                caches[idx].put(keys[idx], row)
+        return rows
+
+    def _cache_for(self, key: tuple[str, str, str]) -> BasePredictionCache:
+        if self.point_cache is not None and key[0].startswith("point:"):
+            return self.point_cache
+        return self.cache
+
+    def _run_model(self, requests: List[Dict[str, Any]]):
+        features = self._features(requests, as_frame=not isinstance(self.model, CompiledForest))
+        with STAGE_SECONDS.time(stage="model_predict"):
+            return self.model.predict(features)
+
+    def _run_model_trees(self, requests: List[Dict[str, Any]]) -> np.ndarray:
+        """Per-tree outputs, shaped (trees per target, len(requests), targets)."""
+        forest = self._tree_forest()
+        features = self._features(requests, as_frame=False)
+        with STAGE_SECONDS.time(stage="model_predict"):
+            return forest.tree_predictions(features)
+
+    def _features(self, requests: List[Dict[str, Any]], as_frame: bool):
+        with STAGE_SECONDS.time(stage="feature_vector"):
+            rows = [build_feature_vector(req["metrics"], req["business_type"], req["scale"]) for req in requests]
+        with STAGE_SECONDS.time(stage="frame"):
+            if not as_frame:
+                return np.array([[row[column] for column in self.feature_columns] for row in rows])
+            import pandas as pd
+
+            # sklearn was fitted on a DataFrame and checks the column names.
+            return pd.DataFrame(rows)[self.feature_columns]
+
+    def _tree_forest(self) -> CompiledForest:
+        """The model as a :class:`CompiledForest`, compiled once on first use for the sklearn engine."""
+        if isinstance(self.model, CompiledForest):
+            return self.model
+        if self._tree_forest_cache is None:
+            with self._tree_forest_lock:
+                built = self._tree_forest_cache is None
+                if built:
+                    self._tree_forest_cache = CompiledForest.from_estimator(self.model)
+            if built and self.on_resize is not None:
+                self.on_resize()
+        return self._tree_forest_cache
+
+    def _uncertainty(self, requests: List[Dict[str, Any]], samples: np.ndarray) -> List[Dict[str, Any]]:
+        """Interval and quantiles of each output across trees, after the context adjustments.
+
+        Every tree's prediction goes through the same clamping as the point
+        estimate, so the bounds respect the payroll floor and ceiling.
+        """
+        jobs = np.array(
+            [
+                max(
+                    config.BUSINESS_TYPE_INFO[req["business_type"]]["base_jobs"]
+                    * config.SCALE_FACTORS.get(req["scale"], 1.0),
+                    1.0,
+                )
+                for req in requests
+            ]
+        )
+        base = {
+            "wages": samples[..., 0],
+            "foot_traffic": samples[..., 1],
+            "local_spending": samples[..., 2],
+            "sales_tax": samples[..., 3],
+            "jobs_created": jobs,
+        }
+        context = {
+            name: np.array([float(req["context_signals"].get(name, 1.0)) for req in requests])
+            for name in CONTEXT_SIGNAL_BOUNDS
+        }
+        adjusted = self._apply_context_adjustments_array(base, context)
+        # (trees, requests, columns)
+        stacked = np.stack([adjusted[column] for column in UNCERTAINTY_COLUMNS], axis=-1)
+        spread = stacked.std(axis=0)
+        blocks: List[Dict[str, Any]] = []
+        for position, req in enumerate(requests):
+            level = float(req["uncertainty"].get("level", DEFAULT_INTERVAL_LEVEL))
+            quantiles = [float(q) for q in req["uncertainty"].get("quantiles") or []]
+            probabilities = [(1.0 - level) / 2.0, (1.0 + level) / 2.0, *quantiles]
+            values = np.quantile(stacked[:, position, :], probabilities, axis=0)
+            block: Dict[str, Any] = {"level": level}
+            for column_idx, column in enumerate(UNCERTAINTY_COLUMNS):
+                block[column] = {
+                    "lower": float(values[0, column_idx]),
+                    "upper": float(values[1, column_idx]),
+                    "std": float(spread[position, column_idx]),
+                    "quantiles": {f"{q:g}": float(values[2 + q_idx, column_idx]) for q_idx, q in enumerate(quantiles)},
+                }
+            blocks.append(block)
+        return blocks
 
-        features = self.engineer.build_feature_vector(location_key, business_type, scale)
-        features_frame = pd.DataFrame([features])[self.feature_columns]
-        predictions = self.model.predict(features_frame)[0]
+    @staticmethod
+    def _cache_key(request: Dict[str, Any]) -> tuple[str, str, str]:
+        return (request["location_key"], request["business_type"], request["scale"])
 
-        metrics = self.repository.get_metrics(location_key)
+    def _normalize_payload(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if payload.get("latitude") is not None and payload.get("longitude") is not None:
+            lat = round(float(payload["latitude"]), POINT_PRECISION)
+            lon = round(float(payload["longitude"]), POINT_PRECISION)
+            radius_km = float(payload.get("radius_km") or DEFAULT_POINT_RADIUS_KM)
+            location_key = f"point:{lat},{lon},{radius_km:g}"
+            metrics = self.point_metrics(lat, lon, radius_km)
+        else:
+            location_key = payload["location_key"].lower()
+            metrics = self.get_metrics(location_key)
+        return {
+            "business_type": payload["business_type"].lower(),
+            "scale": payload["scale"].lower(),
+            "location_key": location_key,
+            "metrics": metrics,
+            "context_signals": payload.get("context_signals") or {},
+            "uncertainty": payload.get("uncertainty"),
+        }
+
+    def get_metrics(self, location_key: str) -> LocationMetrics:
+        try:
+            return self.location_metrics[location_key]
+        except KeyError as exc:
+            raise KeyError(f"Unknown location profile {location_key}") from exc
+
+    def point_metrics(self, lat: float, lon: float, radius_km: float = DEFAULT_POINT_RADIUS_KM) -> LocationMetrics:
+        """Location metrics for an arbitrary pin; indexes are built on first use."""
+        if self._point_index is None:
+            with self._point_index_lock:
+                if self._point_index is None:
+                    from ml.point_metrics import PointMetricsIndex
+
+                    self._point_index = PointMetricsIndex(self._dataset_loader(), self.location_metrics)
+        return self._point_index.metrics_for(lat, lon, radius_km)
+
+    def _dataset_loader(self) -> DatasetLoader:
+        """The loader profile metrics were built from, so pins are measured on the same datasets.
+
+        Bundles carry metrics the trainer built with the default regional loader; build that on demand.
+        """
+        if self.loader is None:
+            from ml.data_loader import DatasetLoader
+
+            self.loader = DatasetLoader(regions=config.REGIONAL_DATASETS)
+        return self.loader
+
+    def sweep(self, payload: Dict[str, Any], signals: Dict[str, Sequence[float]]) -> Dict[str, Any]:
+        """Score one scenario under every combination of the given context signal values.
+
+        The model runs once; the context adjustments are applied as array
+        operations over the Cartesian product of ``signals`` (in the order
+        given). Signals not swept keep the scenario's own ``context_signals``
+        value. ``values`` has one row per combination, ``SWEEP_COLUMNS`` wide,
+        with the last axis varying fastest.
+        """
+        unknown = set(signals) - set(CONTEXT_SIGNAL_BOUNDS)
+        if unknown:
+            raise ValueError(f"Unknown context signals: {', '.join(sorted(unknown))}")
+        request = self._normalize_payload(payload)
+        base = self._base_prediction(request, self._predict_base([request])[0])
+        axes = {name: np.asarray(values, dtype=np.float64) for name, values in signals.items()}
+        grids = np.meshgrid(*axes.values(), indexing="ij") if axes else []
+        context = {
+            name: np.asarray(request["context_signals"].get(name, 1.0), dtype=np.float64)
+            for name in CONTEXT_SIGNAL_BOUNDS
+        }
+        context.update({name: grid.ravel() for name, grid in zip(axes, grids)})
+        with STAGE_SECONDS.time(stage="context_adjustment"):
+            adjusted = self._apply_context_adjustments_array(base, context)
+            size = int(np.prod([len(values) for values in axes.values()], dtype=np.int64))
+            values = np.column_stack([np.broadcast_to(adjusted[column], (size,)) for column in SWEEP_COLUMNS])
+        result = self._describe(request)
+        result.update(
+            {
+                "base_prediction": base,
+                "axes": {name: values.tolist() for name, values in axes.items()},
+                "shape": [len(values) for values in axes.values()],
+                "columns": list(SWEEP_COLUMNS),
+                "values": values,
+            }
+        )
+        return result
+
+    def rank(
+        self,
+        business_type: str,
+        target: str = "local_spending",
+        k: int = 5,
+        scales: Sequence[str] | None = None,
+        context_signals: Dict[str, Any] | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Top ``k`` location profiles for ``business_type`` by ``target``, each at its best scale, best first.
+
+        Every (profile, scale) pair is scored in one model call and the
+        context adjustments are applied as arrays; each profile keeps only
+        its best-scoring scale, and ``argpartition`` picks the top ``k`` of
+        those so only they are sorted.
+        """
+        if target not in RANK_TARGETS:
+            raise ValueError(f"Unsupported ranking target: {target}")
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        scales = [scale.lower() for scale in (scales or config.SCALE_FACTORS)]
+        unknown = [scale for scale in scales if scale not in config.SCALE_FACTORS]
+        if unknown:
+            raise ValueError(f"Unknown scales: {', '.join(unknown)}")
+        payloads = [
+            {"business_type": business_type, "scale": scale, "location_key": key, "context_signals": context_signals}
+            for key in self.location_metrics
+            for scale in scales
+        ]
+        requests = [self._normalize_payload(payload) for payload in payloads]
+        predictions = np.asarray(self._predict_base(requests), dtype=np.float64)
+        base_jobs = config.BUSINESS_TYPE_INFO[requests[0]["business_type"]]["base_jobs"]
+        base = {
+            "wages": predictions[:, 0],
+            "foot_traffic": predictions[:, 1],
+            "local_spending": predictions[:, 2],
+            "sales_tax": predictions[:, 3],
+            "jobs_created": np.maximum(
+                base_jobs * np.array([config.SCALE_FACTORS[req["scale"]] for req in requests]), 1.0
+            ),
+        }
+        context = {
+            name: np.asarray(float((context_signals or {}).get(name, 1.0))) for name in CONTEXT_SIGNAL_BOUNDS
+        }
+        with STAGE_SECONDS.time(stage="context_adjustment"):
+            adjusted = self._apply_context_adjustments_array(base, context)
+        scores = np.broadcast_to(adjusted[target], (len(requests),))
+        # Candidates are profile-major with one row per scale; keep each profile's best scale (the
+        # earliest listed on ties), so one profile cannot fill the ranking at several sizes.
+        per_profile = scores.reshape(-1, len(scales))
+        candidates = np.arange(per_profile.shape[0]) * len(scales) + per_profile.argmax(axis=1)
+        candidate_scores = scores[candidates]
+        k = min(k, len(candidates))
+        cutoff = candidate_scores[np.argpartition(-candidate_scores, k - 1)[k - 1]]
+        # Everything scoring at least the k-th best survives, so ties at the cut-off resolve by profile
+        # order rather than by partition order; only the survivors are sorted.
+        top = candidates[candidate_scores >= cutoff]
+        top = top[np.lexsort((top, -scores[top]))][:k]
+        return [
+            {
+                "rank": rank,
+                "location_key": requests[idx]["location_key"],
+                "scale": requests[idx]["scale"],
+                "score": float(scores[idx]),
+                **{column: float(np.broadcast_to(adjusted[column], scores.shape)[idx]) for column in SWEEP_COLUMNS},
+            }
+            for rank, idx in enumerate(top, start=1)
+        ]
+
+    def _base_prediction(self, request: Dict[str, Any], predictions) -> Dict[str, float]:
         jobs_created = max(
-            config.BUSINESS_TYPE_INFO[business_type]["base_jobs"] * config.SCALE_FACTORS.get(scale, 1.0),
+            config.BUSINESS_TYPE_INFO[request["business_type"]]["base_jobs"]
+            * config.SCALE_FACTORS.get(request["scale"], 1.0),
             1.0,
         )
-
-        base_prediction = {
+        return {
             "wages": float(predictions[0]),
             "foot_traffic": float(predictions[1]),
             "local_spending": float(predictions[2]),
@@ -62,18 +507,26 @@ class PredictionPipeline:
             "jobs_created": float(jobs_created),
         }
 
-        adjusted = self._apply_context_adjustments(base_prediction, context_signals)
-        adjusted["feature_snapshot"] = {
-            "population_density": metrics.population_density,
-            "median_income": metrics.median_income,
-            "unemployment_rate": metrics.unemployment_rate,
-            "transit_score": metrics.transit_score,
-            "existing_business_count": metrics.existing_business_count,
+    def _describe(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        metrics = request["metrics"]
+        return {
+            "feature_snapshot": {
+                "population_density": metrics.population_density,
+                "median_income": metrics.median_income,
+                "unemployment_rate": metrics.unemployment_rate,
+                "transit_score": metrics.transit_score,
+                "existing_business_count": metrics.existing_business_count,
+            },
+            "benchmarks": self.benchmarks,
+            "location_key": request["location_key"],
+            "business_type": request["business_type"],
+            "scale": request["scale"],
         }
-        adjusted["benchmarks"] = self.benchmarks
-        adjusted["location_key"] = location_key
-        adjusted["business_type"] = business_type
-        adjusted["scale"] = scale
+
+    def _build_result(self, request: Dict[str, Any], predictions) -> Dict[str, Any]:
+        context_signals = request["context_signals"]
+        adjusted = self._apply_context_adjustments(self._base_prediction(request, predictions), context_signals)
+        adjusted.update(self._describe(request))
         adjusted["context_applied"] = bool(context_signals)
         return adjusted
 
@@ -81,19 +534,22 @@ class PredictionPipeline:
         def clamp(value: float, low: float, high: float) -> float:
             return max(low, min(high, value))
 
-        demand_boost = clamp(float(context.get("demandBoost", 1.0)), 0.6, 1.8)
-        spend_premium = clamp(float(context.get("spendPremium", 1.0)), 0.65, 1.6)
-        wage_premium = clamp(float(context.get("wagePremium", 1.0)), 0.65, 1.45)
-        confidence = clamp(float(context.get("confidence", 1.0)), 0.7, 1.15)
+        demand_boost = clamp(float(context.get("demandBoost", 1.0)), *CONTEXT_SIGNAL_BOUNDS["demandBoost"])
+        spend_premium = clamp(float(context.get("spendPremium", 1.0)), *CONTEXT_SIGNAL_BOUNDS["spendPremium"])
+        wage_premium = clamp(float(context.get("wagePremium", 1.0)), *CONTEXT_SIGNAL_BOUNDS["wagePremium"])
+        confidence = clamp(float(context.get("confidence", 1.0)), *CONTEXT_SIGNAL_BOUNDS["confidence"])
 
         foot_traffic = base["foot_traffic"] * demand_boost
         local_spending = base["local_spending"] * demand_boost * spend_premium
 
-        payroll_ceiling = local_spending * 0.58
-        payroll_floor = local_spending * 0.28
+        payroll_floor_share, payroll_ceiling_share = PAYROLL_SHARE_BOUNDS
+        payroll_ceiling = local_spending * payroll_ceiling_share
+        payroll_floor = local_spending * payroll_floor_share
         wages = max(min(base["wages"] * wage_premium, payroll_ceiling), payroll_floor)
         sales_tax = local_spending * config.NY_SALES_TAX_RATE
-        jobs_multiplier = clamp((demand_boost * 0.6) + (wage_premium * 0.3) + (spend_premium * 0.1), 0.7, 1.6)
+        jobs_multiplier = clamp(
+            (demand_boost * 0.6) + (wage_premium * 0.3) + (spend_premium * 0.1), *JOBS_MULTIPLIER_BOUNDS
+        )
         jobs_created = max(base.get("jobs_created", 0.0) * jobs_multiplier, 1.0)
 
         return {
@@ -105,22 +561,35 @@ class PredictionPipeline:
             "jobs_created": float(jobs_created),
         }
 
-    def _compute_benchmarks(self) -> Dict[str, float]:
-        values = {
-            "population_density": [],
-            "median_income": [],
-            "unemployment_rate": [],
-            "transit_score": [],
-            "existing_business_count": [],
-        }
-        for metrics in self.repository._metrics.values():
-            values["population_density"].append(metrics.population_density)
-            values["median_income"].append(metrics.median_income)
-            values["unemployment_rate"].append(metrics.unemployment_rate)
-            values["transit_score"].append(metrics.transit_score)
-            values["existing_business_count"].append(metrics.existing_business_count)
+    @staticmethod
+    def _apply_context_adjustments_array(
+        base: Dict[str, float], context: Dict[str, np.ndarray]
+    ) -> Dict[str, np.ndarray]:
+        """Array form of :meth:`_apply_context_adjustments`; signals broadcast against each other."""
+        demand_boost = np.clip(context["demandBoost"], *CONTEXT_SIGNAL_BOUNDS["demandBoost"])
+        spend_premium = np.clip(context["spendPremium"], *CONTEXT_SIGNAL_BOUNDS["spendPremium"])
+        wage_premium = np.clip(context["wagePremium"], *CONTEXT_SIGNAL_BOUNDS["wagePremium"])
+        confidence = np.clip(context["confidence"], *CONTEXT_SIGNAL_BOUNDS["confidence"])
 
-        def safe_avg(items):
-            return float(sum(items) / len(items)) if items else 0.0
+        foot_traffic = base["foot_traffic"] * demand_boost
+        local_spending = base["local_spending"] * demand_boost * spend_premium
 
-        return {key: safe_avg(val) for key, val in values.items()}
+        payroll_floor_share, payroll_ceiling_share = PAYROLL_SHARE_BOUNDS
+        wages = np.maximum(
+            np.minimum(base["wages"] * wage_premium, local_spending * payroll_ceiling_share),
+            local_spending * payroll_floor_share,
+        )
+        sales_tax = local_spending * config.NY_SALES_TAX_RATE
+        jobs_multiplier = np.clip(
+            (demand_boost * 0.6) + (wage_premium * 0.3) + (spend_premium * 0.1), *JOBS_MULTIPLIER_BOUNDS
+        )
+        jobs_created = np.maximum(base.get("jobs_created", 0.0) * jobs_multiplier, 1.0)
+
+        return {
+            "wages": wages,
+            "foot_traffic": foot_traffic,
+            "local_spending": local_spending,
+            "sales_tax": sales_tax,
+            "confidence": confidence,
+            "jobs_created": jobs_created,
+        }
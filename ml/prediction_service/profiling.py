@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import marshal
+import pstats
+import random
+import threading
+import time
+from typing import Any, Callable, Dict
+
+PROFILE_SCOPES = ("predict", "load")
+PROFILE_SORT_KEYS = ("cumulative", "tottime", "ncalls", "filename")
+
+
+class RequestProfiler:
+    """Runs a sampled fraction of calls under ``cProfile`` and aggregates the stats.
+
+    With ``rate`` at 0 (the default) :meth:`sample` is a single attribute
+    check and nothing is profiled. Only one call is profiled at a time (newer
+    interpreters allow a single active profiler per process); sampled calls
+    that arrive meanwhile simply run unprofiled. Stats are merged per scope
+    (``predict`` for request handling, ``load`` for pipeline construction)
+    and can be read back as text or as a ``pstats`` file for snakeviz or
+    ``python -m pstats``.
+    """
+
+    def __init__(self, rate: float = 0.0):
+        self.rate = 0.0
+        self.set_rate(rate)
+        self._lock = threading.Lock()
+        self._active = threading.Lock()
+        self._stats: Dict[str, pstats.Stats] = {}
+        self._samples: Dict[str, int] = {scope: 0 for scope in PROFILE_SCOPES}
+        self._profiled_seconds: Dict[str, float] = {scope: 0.0 for scope in PROFILE_SCOPES}
+
+    def set_rate(self, rate: float) -> None:
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError("Profiling rate must be between 0 and 1")
+        self.rate = rate
+
+    def sample(self) -> bool:
+        return self.rate > 0 and (self.rate >= 1.0 or random.random() < self.rate)
+
+    def call(self, scope: str, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run ``fn(*args)`` under a profiler and fold its stats into ``scope``."""
+        if scope not in PROFILE_SCOPES:
+            raise ValueError(f"Unknown profiling scope: {scope}")
+        if not self._active.acquire(blocking=False):
+            return fn(*args)
+        profile = cProfile.Profile()
+        started = time.perf_counter()
+        try:
+            return profile.runcall(fn, *args)
+        finally:
+            elapsed = time.perf_counter() - started
+            self._active.release()
+            with self._lock:
+                if scope in self._stats:
+                    self._stats[scope].add(profile)
+                else:
+                    self._stats[scope] = pstats.Stats(profile)
+                self._samples[scope] += 1
+                self._profiled_seconds[scope] += elapsed
+
+    def maybe_call(self, scope: str, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.sample():
+            return self.call(scope, fn, *args)
+        return fn(*args)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.rate > 0,
+                "rate": self.rate,
+                "samples": dict(self._samples),
+                "profiled_seconds": dict(self._profiled_seconds),
+            }
+
+    def report(self, scope: str = "predict", sort: str = "cumulative", limit: int = 40) -> str:
+        if sort not in PROFILE_SORT_KEYS:
+            raise ValueError(f"Unsupported sort key: {sort}")
+        buffer = io.StringIO()
+        with self._lock:
+            stats = self._stats.get(scope)
+            if stats is None:
+                return f"No {scope} samples collected yet.\n"
+            stats.stream = buffer
+            stats.sort_stats(sort).print_stats(limit)
+        return buffer.getvalue()
+
+    def dump(self, scope: str = "predict") -> bytes:
+        """Aggregated stats in the on-disk format read by ``pstats.Stats(path)``."""
+        with self._lock:
+            stats = self._stats.get(scope)
+            if stats is None:
+                raise KeyError(f"No {scope} samples collected yet")
+            return marshal.dumps(stats.stats)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._samples = {scope: 0 for scope in PROFILE_SCOPES}
+            self._profiled_seconds = {scope: 0.0 for scope in PROFILE_SCOPES}
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, TypeVar
+
+from ml.prediction_service.metrics import REGISTRY_EVICTIONS_TOTAL, REGISTRY_LOADS_TOTAL, REGISTRY_RESIDENT_BYTES
+
+# A model is a directory under the registry root: "albany" or "albany/v2".
+MODEL_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*(/[A-Za-z0-9][A-Za-z0-9_.-]*)?$")
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Entry(Generic[T]):
+    value: T
+    size_bytes: int
+    load_seconds: float
+    loaded_at: float
+    hits: int = 0
+
+
+class ModelRegistry(Generic[T]):
+    """Loads models from subdirectories of ``root`` on first use and keeps them under a memory budget.
+
+    Residents are kept in least-recently-used order. Each model is sized
+    once by ``sizer`` when it loads (and again through :meth:`resize` if it
+    grows); after every load or resize the oldest models are evicted until
+    the summed sizes fit ``memory_budget_bytes``. The model just loaded or
+    resized is never evicted, so a single model larger than the budget
+    still serves. Eviction only drops the registry's reference, so requests
+    already holding a model finish on it. Concurrent first requests for one
+    model share a single load.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        loader: Callable[[Path], T],
+        sizer: Callable[[T], int],
+        memory_budget_bytes: int,
+    ):
+        self.root = Path(root).resolve()
+        self.loader = loader
+        self.sizer = sizer
+        self.memory_budget_bytes = memory_budget_bytes
+        self.loads = 0
+        self.load_failures = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, _Entry[T]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: Dict[str, threading.Lock] = {}
+
+    def get(self, model_id: str) -> T:
+        with self._lock:
+            entry = self._entries.get(model_id)
+            if entry is not None:
+                self._entries.move_to_end(model_id)
+                entry.hits += 1
+                return entry.value
+        path = self._resolve(model_id)
+        with self._lock:
+            load_lock = self._loading.setdefault(model_id, threading.Lock())
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(model_id)
+                if entry is not None:
+                    self._entries.move_to_end(model_id)
+                    entry.hits += 1
+                    return entry.value
+            return self._load(model_id, path)
+
+    def resize(self, model_id: str) -> None:
+        """Re-measure a resident model that grew after loading and re-apply the budget."""
+        with self._lock:
+            entry = self._entries.get(model_id)
+        if entry is None:
+            return
+        size = self.sizer(entry.value)
+        with self._lock:
+            if self._entries.get(model_id) is not entry:
+                return
+            entry.size_bytes = size
+            self._evict_over_budget(keep=model_id)
+            REGISTRY_RESIDENT_BYTES.set(self._resident_bytes())
+
+    def evict(self, model_id: str) -> bool:
+        with self._lock:
+            if self._entries.pop(model_id, None) is None:
+                return False
+            self.evictions += 1
+            REGISTRY_EVICTIONS_TOTAL.inc(model=model_id)
+            REGISTRY_RESIDENT_BYTES.set(self._resident_bytes())
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = {"loads": self.loads, "load_failures": self.load_failures, "evictions": self.evictions}
+            models = {
+                model_id: {
+                    "resident_bytes": entry.size_bytes,
+                    "load_seconds": entry.load_seconds,
+                    "loaded_at": entry.loaded_at,
+                    "hits": entry.hits,
+                }
+                for model_id, entry in self._entries.items()
+            }
+        return {
+            "memory_budget_bytes": self.memory_budget_bytes,
+            "resident_bytes": sum(model["resident_bytes"] for model in models.values()),
+            **counters,
+            # Least recently used first, i.e. in eviction order.
+            "models": models,
+        }
+
+    def _resolve(self, model_id: str) -> Path:
+        if not MODEL_ID_PATTERN.match(model_id):
+            raise ValueError(f"Invalid model id: {model_id}")
+        path = (self.root / model_id).resolve()
+        if self.root not in path.parents or not path.is_dir():
+            raise KeyError(f"Unknown model {model_id}")
+        return path
+
+    def _load(self, model_id: str, path: Path) -> T:
+        started = time.perf_counter()
+        try:
+            value = self.loader(path)
+        except Exception:
+            with self._lock:
+                self.load_failures += 1
+            REGISTRY_LOADS_TOTAL.inc(model=model_id, result="failure")
+            raise
+        load_seconds = time.perf_counter() - started
+        entry = _Entry(value=value, size_bytes=self.sizer(value), load_seconds=load_seconds, loaded_at=time.time())
+        REGISTRY_LOADS_TOTAL.inc(model=model_id, result="success")
+        with self._lock:
+            self._entries[model_id] = entry
+            self.loads += 1
+            self._evict_over_budget(keep=model_id)
+            REGISTRY_RESIDENT_BYTES.set(self._resident_bytes())
+        return value
+
+    def _evict_over_budget(self, keep: str) -> None:
+        total = self._resident_bytes()
+        for model_id in list(self._entries):
+            if total <= self.memory_budget_bytes:
+                break
+            if model_id == keep:
+                continue
+            total -= self._entries.pop(model_id).size_bytes
+            self.evictions += 1
+            REGISTRY_EVICTIONS_TOTAL.inc(model=model_id)
+
+    def _resident_bytes(self) -> int:
+        return sum(entry.size_bytes for entry in self._entries.values())
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Callable, List, Sequence, Tuple
+
+Signature = Tuple[Tuple[str, int, int], ...]
+
+
+def artifact_signature(paths: Sequence[Path]) -> Signature:
+    """(name, mtime_ns, size) of each existing path; changes whenever a file is rewritten or replaced."""
+    entries: List[Tuple[str, int, int]] = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(entries)
+
+
+class ModelWatcher:
+    """Polls model artifacts and calls ``on_change`` once a new set has settled.
+
+    The trainer writes several files one after another, so a change only
+    fires after the signature has stayed the same for one further poll;
+    reloading halfway through a training run would pair a new model with
+    old feature columns. ``on_change`` returns whether it handled the
+    change; when it did not (a reload was already running) the same files
+    are tried again on the next poll.
+    """
+
+    def __init__(
+        self,
+        paths: Callable[[], Sequence[Path]],
+        on_change: Callable[[], bool],
+        interval_seconds: float = 5.0,
+    ):
+        self.paths = paths
+        self.on_change = on_change
+        self.interval = interval_seconds
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._current = artifact_signature(self.paths())
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="model-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def signature(self) -> Signature:
+        return artifact_signature(self.paths())
+
+    def mark_current(self, signature: Signature | None = None) -> None:
+        """Adopt ``signature`` (default: the files on disk now) as the served set, e.g. after an admin reload."""
+        self._current = self.signature() if signature is None else signature
+
+    def _run(self) -> None:
+        pending: Signature | None = None
+        while not self._stop.wait(self.interval):
+            signature = artifact_signature(self.paths())
+            if signature == self._current:
+                pending = None
+            elif signature != pending:
+                pending = signature
+            elif self.on_change():
+                self._current = signature
+                pending = None
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from ml.benchmarks.suite import (
+    BENCHMARKS,
+    DEFAULT_BASELINE_PATH,
+    DEFAULT_FIXTURES_ROOT,
+    DEFAULT_SCALES,
+    DEFAULT_TOLERANCE,
+    compare,
+    load_results,
+    run_suite,
+    save_results,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the ML pipeline against bundled and scaled datasets")
+    parser.add_argument(
+        "--scales", type=int, nargs="+", default=list(DEFAULT_SCALES), help="Dataset multipliers to run (1 = bundled)"
+    )
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        choices=[benchmark.name for benchmark in BENCHMARKS],
+        default=None,
+        help="Run only these benchmarks",
+    )
+    parser.add_argument(
+        "--fixtures-dir", type=str, default=str(DEFAULT_FIXTURES_ROOT), help="Where scaled fixtures are generated"
+    )
+    parser.add_argument("--output", type=str, default=None, help="Optional path to write this run's results")
+    parser.add_argument(
+        "--baseline", type=str, default=str(DEFAULT_BASELINE_PATH), help="Baseline results to compare against"
+    )
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument(
+        "--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed slowdown or memory growth (0.25 = 25%%)"
+    )
+    parser.add_argument(
+        "--fail-on-regression", action="store_true", help="Exit non-zero when a benchmark regresses past tolerance"
+    )
+    args = parser.parse_args()
+
+    results = run_suite(scales=args.scales, only=args.only, fixtures_root=Path(args.fixtures_dir))
+    if args.output:
+        save_results(results, Path(args.output))
+
+    baseline_path = Path(args.baseline)
+    regressed = False
+    if baseline_path.exists() and not args.save_baseline:
+        print(f"\nCompared with {baseline_path}:")
+        for line in compare(results, load_results(baseline_path), args.tolerance):
+            regressed = regressed or line.endswith("REGRESSION")
+            print(line)
+    if args.save_baseline:
+        save_results(results, baseline_path)
+        print("Baseline saved to", baseline_path)
+    if regressed and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping
+
+import numpy as np
+
+from ml.compiled_forest import CompiledForest
+from ml.location_metrics import LocationMetrics
+from ml.utils.npz import load_npz, save_npz_atomic
+
+SERVING_BUNDLE_FILENAME = "serving_bundle.npz"
+SERVING_BUNDLE_VERSION = 1
+
+BENCHMARK_FIELDS = (
+    "population_density",
+    "median_income",
+    "unemployment_rate",
+    "transit_score",
+    "existing_business_count",
+)
+
+
+def compute_benchmarks(metrics: Iterable[LocationMetrics]) -> Dict[str, float]:
+    """Average of each snapshot field across all known locations."""
+    values: Dict[str, List[float]] = {field: [] for field in BENCHMARK_FIELDS}
+    for entry in metrics:
+        for field in BENCHMARK_FIELDS:
+            values[field].append(getattr(entry, field))
+
+    def safe_avg(items):
+        return float(sum(items) / len(items)) if items else 0.0
+
+    return {key: safe_avg(val) for key, val in values.items()}
+
+
+@dataclass
+class ServingBundle:
+    """Everything the prediction service needs, in one file.
+
+    The forest is stored as :class:`CompiledForest` arrays and the rest as a
+    JSON manifest inside the same ``.npz``, so loading needs neither pickle,
+    sklearn nor the raw datasets.
+    """
+
+    model: CompiledForest
+    feature_columns: List[str]
+    target_columns: List[str]
+    metrics: Dict[str, LocationMetrics]
+    benchmarks: Dict[str, float]
+
+    @classmethod
+    def build(
+        cls,
+        model: CompiledForest,
+        feature_columns: List[str],
+        target_columns: List[str],
+        metrics: Mapping[str, LocationMetrics],
+    ) -> "ServingBundle":
+        return cls(
+            model=model,
+            feature_columns=list(feature_columns),
+            target_columns=list(target_columns),
+            metrics=dict(metrics),
+            benchmarks=compute_benchmarks(metrics.values()),
+        )
+
+    def save(self, path: Path) -> None:
+        manifest = {
+            "version": SERVING_BUNDLE_VERSION,
+            "feature_columns": self.feature_columns,
+            "target_columns": self.target_columns,
+            "metrics": {key: value.to_json() for key, value in self.metrics.items()},
+            "benchmarks": self.benchmarks,
+        }
+        arrays = {f"forest_{name}": array for name, array in self.model.to_arrays().items()}
+        save_npz_atomic(path, {"manifest": np.array(json.dumps(manifest)), **arrays})
+
+    @classmethod
+    def load(cls, path: Path, mmap: bool = False) -> "ServingBundle":
+        """Load a bundle; with ``mmap`` the forest arrays are mapped read-only from the file."""
+        payload = load_npz(path, mmap=mmap)
+        manifest = json.loads(str(payload["manifest"]))
+        if manifest.get("version") != SERVING_BUNDLE_VERSION:
+            raise ValueError(f"Unsupported serving bundle version in {path}: {manifest.get('version')}")
+        model = CompiledForest.from_arrays(
+            {name[len("forest_"):]: array for name, array in payload.items() if name.startswith("forest_")}
+        )
+        return cls(
+            model=model,
+            feature_columns=manifest["feature_columns"],
+            target_columns=manifest["target_columns"],
+            metrics={key: LocationMetrics(**value) for key, value in manifest["metrics"].items()},
+            benchmarks=manifest["benchmarks"],
+        )
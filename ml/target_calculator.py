@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
 
 from ml import config
 from ml.utils.geo import bbox_area_km2
@@ -22,40 +24,70 @@ class TargetCalculator:
     @classmethod
     def calculate(cls, location_key: str, business_type: str, scale: str, repository) -> Dict[str, float]:
         metrics = repository.get_metrics(location_key)
-        jobs = cls._estimate_jobs(business_type, scale)
-        base_wages = cls._estimate_wages(jobs, metrics.median_income)
-        foot_traffic = cls._estimate_foot_traffic(metrics.population_density, metrics.transit_score, business_type)
-        spending = foot_traffic * config.BUSINESS_TYPE_INFO[business_type]["avg_spend"]
-        income_factor = 0.85 + 0.3 * (metrics.median_income / config.NATIONAL_MEDIAN_INCOME)
-        adjusted_spending = max(spending * income_factor, 1.0)
+        targets = cls.calculate_batch(
+            median_income=[metrics.median_income],
+            population_density=[metrics.population_density],
+            transit_score=[metrics.transit_score],
+            business_types=[business_type],
+            scales=[scale],
+        )
+        return {name: float(values[0]) for name, values in targets.items()}
+
+    @classmethod
+    def calculate_batch(
+        cls,
+        median_income: Sequence[float],
+        population_density: Sequence[float],
+        transit_score: Sequence[float],
+        business_types: Sequence[str],
+        scales: Sequence[str],
+    ) -> Dict[str, np.ndarray]:
+        """Targets for many rows at once; each argument holds one entry per row."""
+        median_income = np.asarray(median_income, dtype=np.float64)
+        density = np.asarray(population_density, dtype=np.float64)
+        transit = np.asarray(transit_score, dtype=np.float64)
+        base_jobs, avg_spend, traffic_multiplier = cls._type_attributes(business_types)
+        scale_factors = np.array([config.SCALE_FACTORS.get(scale, 1.0) for scale in scales], dtype=np.float64)
+
+        jobs = np.maximum(base_jobs * scale_factors, 1.0)
+        base_wages = cls._estimate_wages(jobs, median_income)
+        foot_traffic = cls._estimate_foot_traffic(density, transit, traffic_multiplier)
+        spending = foot_traffic * avg_spend
+        income_factor = 0.85 + 0.3 * (median_income / config.NATIONAL_MEDIAN_INCOME)
+        adjusted_spending = np.maximum(spending * income_factor, 1.0)
 
         payroll_ceiling = adjusted_spending * 0.58
         payroll_floor = adjusted_spending * 0.3
-        wages = min(max(base_wages, payroll_floor), payroll_ceiling)
+        wages = np.minimum(np.maximum(base_wages, payroll_floor), payroll_ceiling)
 
         sales_tax = adjusted_spending * config.NY_SALES_TAX_RATE
         return {
-            "wages": float(wages),
-            "foot_traffic": float(foot_traffic),
-            "local_spending": float(adjusted_spending),
-            "sales_tax": float(sales_tax),
+            "wages": wages,
+            "foot_traffic": foot_traffic,
+            "local_spending": adjusted_spending,
+            "sales_tax": sales_tax,
         }
 
     @staticmethod
-    def _estimate_jobs(business_type: str, scale: str) -> float:
-        base_jobs = config.BUSINESS_TYPE_INFO[business_type]["base_jobs"]
-        scale_factor = config.SCALE_FACTORS.get(scale, 1.0)
-        return max(base_jobs * scale_factor, 1.0)
+    def _type_attributes(business_types: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Per-row base jobs, average spend and foot traffic multiplier."""
+        names, codes = np.unique(np.asarray(business_types, dtype=object), return_inverse=True)
+        info = [config.BUSINESS_TYPE_INFO[name] for name in names]
+        table = np.array(
+            [[entry["base_jobs"], entry["avg_spend"], entry["foot_traffic_multiplier"]] for entry in info],
+            dtype=np.float64,
+        ).reshape(-1, 3)
+        rows = table[codes]
+        return rows[:, 0], rows[:, 1], rows[:, 2]
 
     @staticmethod
-    def _estimate_wages(jobs: float, median_income: float) -> float:
+    def _estimate_wages(jobs: np.ndarray, median_income: np.ndarray) -> np.ndarray:
         median_local_wage = median_income * config.WAGE_INCOME_RATIO
         income_adjustment = median_income / config.NATIONAL_MEDIAN_INCOME
         return jobs * median_local_wage * income_adjustment
 
     @staticmethod
-    def _estimate_foot_traffic(density: float, transit_score: float, business_type: str) -> float:
-        multiplier = config.BUSINESS_TYPE_INFO[business_type]["foot_traffic_multiplier"]
+    def _estimate_foot_traffic(density: np.ndarray, transit_score: np.ndarray, multiplier: np.ndarray) -> np.ndarray:
         transit_factor = 1 + (transit_score / config.TRANSIT_SCORE_SCALE)
-        baseline = 60.0 if density < 1500 else 120.0
-        return max((density * multiplier * transit_factor) / 2.5, baseline)
+        baseline = np.where(density < 1500, 60.0, 120.0)
+        return np.maximum((density * multiplier * transit_factor) / 2.5, baseline)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.multioutput import MultiOutputRegressor
+
+from ml import config
+from ml.data_loader import DatasetLoader
+from ml.model_trainer import ModelTrainer
+from ml.prediction_service.predictor import PredictionPipeline
+
+
+class _SmallForestTrainer(ModelTrainer):
+    """The real training pipeline with a forest small enough to fit in a test run."""
+
+    def _build_estimator(self, mode: str):
+        forest = RandomForestRegressor(n_estimators=8, max_depth=8, random_state=0)
+        return forest if mode == "joint" else MultiOutputRegressor(forest)
+
+
+@pytest.fixture(scope="session")
+def dataset_loader(tmp_path_factory):
+    """The bundled regional datasets, with the columnar cache kept out of the source tree."""
+    return DatasetLoader(
+        regions=config.REGIONAL_DATASETS, columnar_cache_dir=tmp_path_factory.mktemp("columnar")
+    )
+
+
+@pytest.fixture(scope="session")
+def trained_models_dir(tmp_path_factory, dataset_loader):
+    """Artifacts and serving bundle of a small model trained on the bundled datasets."""
+    root = tmp_path_factory.mktemp("trained")
+    trainer = _SmallForestTrainer(
+        output_dir=root / "models", loader=dataset_loader, dataset_output=root / "training_data"
+    )
+    trainer.run()
+    return root / "models"
+
+
+@pytest.fixture(scope="session")
+def pipeline(trained_models_dir, dataset_loader):
+    """A serving pipeline for the small trained model, measuring pins on the same datasets."""
+    return PredictionPipeline(models_dir=trained_models_dir, source="bundle", loader=dataset_loader)
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+from pydantic import ValidationError
+
+from ml.prediction_service import app as appmod
+
+
+@pytest.mark.parametrize(
+    "location",
+    [
+        {"locationKey": "downtown_albany", "latitude": 42.65, "longitude": -73.75},
+        {"locationKey": "downtown_albany", "latitude": 42.65},
+        {"latitude": 42.65},
+        {},
+    ],
+)
+def test_request_needs_exactly_one_location(location):
+    with pytest.raises(ValidationError):
+        appmod.PredictionRequest(businessType="retail", scale="small", **location)
+
+
+@pytest.mark.parametrize(
+    "location", [{"locationKey": "downtown_albany"}, {"latitude": 42.65, "longitude": -73.75, "radiusKm": 2.0}]
+)
+def test_request_accepts_a_profile_or_a_pin(location):
+    appmod.PredictionRequest(businessType="retail", scale="small", **location)
+
+
+@pytest.fixture
+def worker_env(monkeypatch):
+    for name in ("PREDICTION_MODEL_ENGINE", "PREDICTION_MODEL_SOURCE", "PREDICTION_MMAP_MODEL"):
+        monkeypatch.delenv(name, raising=False)
+    launched = {}
+    monkeypatch.setattr("uvicorn.run", lambda *args, **kwargs: launched.update(kwargs))
+    return monkeypatch
+
+
+def test_workers_share_a_memory_mapped_bundle_by_default(worker_env, recwarn):
+    appmod.run_workers(4)
+    assert os.environ["PREDICTION_MODEL_SOURCE"] == "bundle"
+    assert os.environ["PREDICTION_MMAP_MODEL"] == "1"
+    assert not [warning for warning in recwarn if issubclass(warning.category, RuntimeWarning)]
+
+
+def test_workers_warn_when_each_loads_its_own_model(worker_env):
+    worker_env.setenv("PREDICTION_MODEL_ENGINE", "sklearn")
+    with pytest.warns(RuntimeWarning, match="private copy"):
+        appmod.run_workers(4)
+    assert "PREDICTION_MODEL_SOURCE" not in os.environ
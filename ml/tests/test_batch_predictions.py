@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ml.prediction_service import app as appmod
+
+# Profile keys and map pins interleaved, across business types and scales.
+ITEMS = [
+    {"businessType": "grocery", "scale": "small", "locationKey": "downtown_albany"},
+    {"businessType": "restaurant", "scale": "large", "latitude": 42.6526, "longitude": -73.7562},
+    {"businessType": "retail", "scale": "medium", "locationKey": "wolf_road", "contextSignals": {"demandBoost": 1.2}},
+    {"businessType": "healthcare", "scale": "small", "latitude": 42.6686, "longitude": -73.7640, "radiusKm": 2.5},
+    {"businessType": "service", "scale": "large", "locationKey": "arbor_hill"},
+    {"businessType": "grocery", "scale": "small", "latitude": 42.6526, "longitude": -73.7562},
+]
+
+
+def _payloads():
+    return [appmod._to_pipeline_payload(appmod.PredictionRequest(**item)) for item in ITEMS]
+
+
+def _assert_results_match(batched, singles):
+    # Batched rows may differ from single ones in the last bit of the vectorised arithmetic.
+    assert len(batched) == len(singles)
+    for batch_result, single_result in zip(batched, singles):
+        assert batch_result.keys() == single_result.keys()
+        for key, value in single_result.items():
+            if isinstance(value, float):
+                assert batch_result[key] == pytest.approx(value, rel=1e-12), key
+            else:
+                assert batch_result[key] == value, key
+
+
+def test_predict_many_matches_single_predictions(pipeline):
+    payloads = _payloads()
+    _assert_results_match(pipeline.predict_many(payloads), [pipeline.predict(payload) for payload in payloads])
+
+
+def test_batch_endpoint_matches_single_endpoint(pipeline, monkeypatch):
+    monkeypatch.setattr(appmod.state, "pipeline", pipeline)
+    client = TestClient(appmod.app)
+    batch = client.post("/predict/batch", json={"items": ITEMS})
+    assert batch.status_code == 200
+    singles = [client.post("/predict", json=item) for item in ITEMS]
+    assert all(response.status_code == 200 for response in singles)
+    _assert_results_match(batch.json()["results"], [response.json() for response in singles])
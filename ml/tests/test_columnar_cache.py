@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from ml.columnar_cache import MANIFEST_FILENAME, ColumnarCache
+
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame({"value": np.arange(5, dtype=np.float64), "kind": ["a", "b", "a", "c", "c"]})
+
+
+def test_concurrent_builders_share_one_entry(tmp_path):
+    source = tmp_path / "source.json"
+    source.write_text("[1, 2, 3]")
+    builders = 8
+    barrier = threading.Barrier(builders)
+    errors = []
+
+    def build() -> pd.DataFrame:
+        # Every builder finishes parsing before any of them writes, so they all race to publish.
+        barrier.wait()
+        return _frame()
+
+    def load() -> None:
+        try:
+            frame = ColumnarCache(tmp_path / "cache").load_frame(source, build)
+            pd.testing.assert_frame_equal(frame.astype({"kind": object}), _frame(), check_dtype=False)
+        except Exception as exc:  # collected and asserted on the main thread
+            errors.append(exc)
+
+    threads = [threading.Thread(target=load) for _ in range(builders)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    entries = list((tmp_path / "cache").iterdir())
+    assert len(entries) == 1
+    assert (entries[0] / MANIFEST_FILENAME).exists()
+
+
+def test_rebuild_replaces_stale_entry(tmp_path):
+    source = tmp_path / "source.json"
+    source.write_text("[1, 2, 3]")
+    cache = ColumnarCache(tmp_path / "cache")
+    cache.load_frame(source, _frame)
+    source.write_text("[1, 2, 3, 4]")
+    cache.load_frame(source, _frame)
+
+    entries = list((tmp_path / "cache").iterdir())
+    assert [entry.name for entry in entries] == [cache._entry_dir(source, "").name]
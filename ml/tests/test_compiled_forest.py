@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.multioutput import MultiOutputRegressor
+
+from ml.compiled_forest import PREDICT_BLOCK_ROWS, CompiledForest
+
+
+def _fit(mode: str):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 5))
+    y = np.column_stack([X[:, 0] * 3 + X[:, 1], np.sin(X[:, 2]), X[:, 3] ** 2, X[:, 4] - X[:, 0]])
+    forest = RandomForestRegressor(n_estimators=7, max_depth=6, random_state=0)
+    estimator = forest if mode == "joint" else MultiOutputRegressor(forest)
+    estimator.fit(X, y)
+    # More rows than one predict block, so the blocked traversal is covered too.
+    X_test = rng.normal(size=(PREDICT_BLOCK_ROWS + 37, 5))
+    return estimator, X_test
+
+
+@pytest.mark.parametrize("mode", ["per_target", "joint"])
+def test_predict_matches_sklearn(mode):
+    estimator, X = _fit(mode)
+    compiled = CompiledForest.from_estimator(estimator)
+    np.testing.assert_allclose(compiled.predict(X), estimator.predict(X), rtol=1e-12, atol=1e-12)
+
+
+def _sklearn_tree_predictions(estimator, X) -> np.ndarray:
+    """(trees per target, rows, targets) straight from the fitted sklearn trees."""
+    if hasattr(estimator, "n_outputs_"):
+        return np.stack([tree.predict(X) for tree in estimator.estimators_])
+    return np.stack(
+        [np.stack([tree.predict(X) for tree in forest.estimators_]) for forest in estimator.estimators_], axis=-1
+    )
+
+
+@pytest.mark.parametrize("mode", ["per_target", "joint"])
+def test_tree_predictions_match_sklearn_trees(mode):
+    estimator, X = _fit(mode)
+    compiled = CompiledForest.from_estimator(estimator)
+    per_tree = compiled.tree_predictions(X)
+    np.testing.assert_allclose(per_tree, _sklearn_tree_predictions(estimator, X), rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(per_tree.mean(axis=0), compiled.predict(X), rtol=1e-12, atol=1e-12)
+
+
+def test_saved_forest_predicts_the_same(tmp_path):
+    estimator, X = _fit("per_target")
+    compiled = CompiledForest.from_estimator(estimator)
+    path = tmp_path / "forest.npz"
+    compiled.save(path)
+    for mmap in (False, True):
+        np.testing.assert_array_equal(CompiledForest.load(path, mmap=mmap).predict(X), compiled.predict(X))
+
+
+def test_per_target_forest_stores_one_value_per_node(tmp_path):
+    estimator, X = _fit("per_target")
+    compiled = CompiledForest.from_estimator(estimator)
+    assert compiled.value.shape == compiled.feature.shape
+
+    # Files from before the compact layout carry a dense (n_nodes, n_targets) matrix.
+    arrays = compiled.to_arrays()
+    dense = np.zeros((len(compiled.value), compiled.n_targets))
+    node_counts = np.diff(np.append(compiled.roots, len(compiled.value)))
+    tree_target = np.repeat(np.arange(compiled.n_targets), compiled.trees_per_target)
+    dense[np.arange(len(dense)), np.repeat(tree_target, node_counts)] = compiled.value
+    legacy = CompiledForest.from_arrays({**arrays, "value": dense})
+    np.testing.assert_array_equal(legacy.value, compiled.value)
+    np.testing.assert_array_equal(legacy.predict(X), compiled.predict(X))
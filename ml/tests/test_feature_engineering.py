@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import json
+
+from ml.config import LOCATION_PROFILES
+from ml.feature_engineering import METRIC_GROUPS, LocationFeatureRepository
+
+
+def _as_json(repository: LocationFeatureRepository) -> dict:
+    return {key: metrics.to_json() for key, metrics in repository._metrics.items()}
+
+
+def test_incremental_rebuild_matches_full_rebuild(tmp_path, dataset_loader, monkeypatch):
+    full = _as_json(LocationFeatureRepository(dataset_loader, cache_path=tmp_path / "full.json"))
+
+    cache_path = tmp_path / "location_metrics.json"
+    LocationFeatureRepository(dataset_loader, cache_path=cache_path)
+    payload = json.loads(cache_path.read_text())
+    # One profile whose definition changed and one dataset group whose sources changed,
+    # with their cached values wrong so only a recomputation can bring them back.
+    changed, *unchanged = [profile.key for profile in LOCATION_PROFILES]
+    payload["profiles"][changed]["fingerprint"] = "stale"
+    payload["profiles"][changed]["metrics"]["median_income"] = -1.0
+    payload["datasets"]["transit"] = "stale"
+    for key in unchanged:
+        payload["profiles"][key]["metrics"]["transit_score"] = -1.0
+    cache_path.write_text(json.dumps(payload))
+
+    calls = []
+    compute = LocationFeatureRepository._compute_metric_groups
+
+    def recording(self, profiles, groups):
+        calls.append(([profile.key for profile in profiles], list(groups)))
+        return compute(self, profiles, groups)
+
+    monkeypatch.setattr(LocationFeatureRepository, "_compute_metric_groups", recording)
+    incremental = LocationFeatureRepository(dataset_loader, cache_path=cache_path)
+
+    assert calls == [([changed], list(METRIC_GROUPS)), (unchanged, ["transit"])]
+    assert _as_json(incremental) == full
+    # The rewritten cache is current, so the next load recomputes nothing.
+    calls.clear()
+    assert _as_json(LocationFeatureRepository(dataset_loader, cache_path=cache_path)) == full
+    assert calls == []
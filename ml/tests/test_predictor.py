@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import itertools
+
+import pytest
+
+from ml.prediction_service.predictor import SWEEP_COLUMNS
+
+
+@pytest.mark.parametrize(
+    "location",
+    [{"location_key": "central_ave"}, {"latitude": 42.6526, "longitude": -73.7562, "radius_km": 1.5}],
+)
+def test_sweep_matches_per_call_predictions(pipeline, location):
+    payload = {"business_type": "restaurant", "scale": "medium", "context_signals": {"confidence": 1.1}, **location}
+    # Values past the signal bounds too, so clamping is compared as well.
+    signals = {"demandBoost": [0.4, 1.0, 1.7, 2.0], "spendPremium": [0.6, 1.3], "wagePremium": [1.5]}
+    result = pipeline.sweep(payload, signals)
+
+    assert result["shape"] == [4, 2, 1]
+    assert len(result["values"]) == 8
+    assert result["columns"] == list(SWEEP_COLUMNS)
+    # Rows follow the Cartesian product with the last signal varying fastest.
+    for row, combination in zip(result["values"], itertools.product(*signals.values())):
+        context = {**payload["context_signals"], **dict(zip(signals, combination))}
+        single = pipeline.predict({**payload, "context_signals": context})
+        assert list(row) == pytest.approx([single[column] for column in SWEEP_COLUMNS], rel=1e-12)
+
+
+def test_rank_lists_each_profile_once_at_its_best_scale(pipeline):
+    ranking = pipeline.rank("grocery", "local_spending", k=len(pipeline.location_metrics))
+    keys = [entry["location_key"] for entry in ranking]
+    assert sorted(keys) == sorted(pipeline.location_metrics)
+    scores = [entry["score"] for entry in ranking]
+    assert scores == sorted(scores, reverse=True)
+
+    by_scale = {
+        scale: {row["location_key"]: row["score"] for row in pipeline.rank("grocery", k=100, scales=[scale])}
+        for scale in ("small", "medium", "large")
+    }
+    for entry in ranking:
+        best = max(by_scale, key=lambda scale: by_scale[scale][entry["location_key"]])
+        assert entry["score"] == by_scale[best][entry["location_key"]]
+        assert by_scale[entry["scale"]][entry["location_key"]] == entry["score"]
+
+
+def test_rank_default_top_k_has_distinct_profiles(pipeline):
+    ranking = pipeline.rank("restaurant", "wages", k=3)
+    assert len(ranking) == 3
+    assert len({entry["location_key"] for entry in ranking}) == 3
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ml.prediction_service import app as appmod
+from ml.prediction_service.registry import ModelRegistry
+
+
+def _registry(tmp_path, sizes, budget):
+    for model_id in sizes:
+        (tmp_path / model_id).mkdir(parents=True)
+    loaded = []
+
+    def load(path):
+        model_id = path.relative_to(tmp_path.resolve()).as_posix()
+        loaded.append(model_id)
+        return {"id": model_id, "size": sizes[model_id]}
+
+    return ModelRegistry(tmp_path, loader=load, sizer=lambda model: model["size"], memory_budget_bytes=budget), loaded
+
+
+def test_least_recently_used_models_are_evicted_first(tmp_path):
+    registry, loaded = _registry(tmp_path, {"a": 40, "b": 40, "c/v1": 40, "d": 40}, budget=100)
+    registry.get("a")
+    registry.get("b")
+    registry.get("a")  # b is now the least recently used
+    registry.get("c/v1")
+    assert list(registry.stats()["models"]) == ["a", "c/v1"]
+
+    registry.get("d")
+    stats = registry.stats()
+    assert list(stats["models"]) == ["c/v1", "d"]
+    assert stats["evictions"] == 2
+    assert stats["resident_bytes"] == 80
+    assert loaded == ["a", "b", "c/v1", "d"]
+
+
+def test_model_over_the_budget_still_serves(tmp_path):
+    registry, _ = _registry(tmp_path, {"small": 10, "huge": 500}, budget=100)
+    registry.get("small")
+    assert registry.get("huge")["id"] == "huge"
+    assert list(registry.stats()["models"]) == ["huge"]
+
+
+def test_resize_evicts_others_but_keeps_the_grown_model(tmp_path):
+    registry, _ = _registry(tmp_path, {"a": 30, "b": 30, "c": 30}, budget=100)
+    for model_id in ("a", "b", "c"):
+        registry.get(model_id)
+    registry.get("b")["size"] = 60
+    registry.resize("b")
+    assert list(registry.stats()["models"]) == ["c", "b"]
+
+
+@pytest.mark.parametrize("model_id", ["../etc", "a/b/c", "missing"])
+def test_unknown_or_invalid_models_are_rejected(tmp_path, model_id):
+    registry, loaded = _registry(tmp_path, {"a": 1}, budget=100)
+    with pytest.raises((KeyError, ValueError)):
+        registry.get(model_id)
+    assert loaded == []
+
+
+def test_named_model_without_bundle_does_not_reveal_server_paths(tmp_path, monkeypatch):
+    (tmp_path / "county" / "v1").mkdir(parents=True)
+    registry = ModelRegistry(
+        tmp_path, loader=appmod._load_named_model, sizer=lambda pipeline: 0, memory_budget_bytes=100
+    )
+    monkeypatch.setattr(appmod, "registry", registry)
+    response = TestClient(appmod.app).post(
+        "/predict",
+        json={"businessType": "retail", "scale": "small", "locationKey": "downtown_albany", "model": "county/v1"},
+    )
+    assert response.status_code == 400
+    assert "county/v1" in response.json()["detail"]
+    assert str(tmp_path) not in response.json()["detail"]
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from ml.prediction_service import app as appmod
+from ml.prediction_service.reloading import ModelWatcher
+
+
+class _Pipeline:
+    """Stands in for a PredictionPipeline; ``gate`` holds predictions until it is set."""
+
+    def __init__(self, name: str, gate: threading.Event | None = None, healthy: bool = True):
+        self.name = name
+        self.gate = gate
+        self.healthy = healthy
+
+    def smoke_test(self) -> None:
+        if not self.healthy:
+            raise ValueError("non-finite outputs")
+
+    def predict_many(self, payloads):
+        if self.gate is not None:
+            assert self.gate.wait(5)
+        return [{"model": self.name} for _ in payloads]
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """Pipelines handed out by successive PipelineState builds, in order."""
+    queue = []
+    monkeypatch.setattr(appmod.PipelineState, "_build", staticmethod(lambda *args, **kwargs: queue.pop(0)))
+    return queue
+
+
+def _wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def test_reload_swaps_without_breaking_in_flight_requests(builds):
+    gate = threading.Event()
+    builds.extend([_Pipeline("old", gate), _Pipeline("new")])
+    state = appmod.PipelineState()
+    state.load()
+
+    results = []
+    in_flight = threading.Thread(target=lambda: results.extend(state.get().predict_many([{}])))
+    in_flight.start()
+    assert state.reload()
+    # New requests see the new model while the old one is still answering.
+    assert state.get().predict_many([{}]) == [{"model": "new"}]
+    assert state.generation == 2
+    gate.set()
+    in_flight.join(5)
+    assert results == [{"model": "old"}]
+
+
+def test_failed_reload_keeps_serving_the_live_pipeline(builds):
+    builds.extend([_Pipeline("old"), _Pipeline("broken", healthy=False)])
+    state = appmod.PipelineState()
+    state.load()
+    assert state.reload()
+    assert state.get().name == "old"
+    assert state.last_reload["ok"] is False
+    assert state.generation == 1
+
+
+def test_watcher_does_not_reload_again_after_an_admin_reload(builds, tmp_path):
+    artifact = tmp_path / "business_impact_model.pkl"
+    artifact.write_bytes(b"v1")
+    builds.extend([_Pipeline("v1"), _Pipeline("v2"), _Pipeline("v3")])
+    state = appmod.PipelineState()
+    state.load()
+    calls = []
+
+    def on_change() -> bool:
+        calls.append(time.monotonic())
+        return state.reload()
+
+    state.watcher = ModelWatcher(lambda: [artifact], on_change, interval_seconds=0.01)
+    state.watcher.start()
+    try:
+        artifact.write_bytes(b"v2, already served by an admin reload")
+        assert state.reload()
+        time.sleep(0.2)
+        assert calls == []
+        assert state.get().name == "v2"
+
+        # A later training run is still picked up, once.
+        artifact.write_bytes(b"v3, written by the trainer")
+        assert _wait_for(lambda: state.get().name == "v3")
+        time.sleep(0.1)
+        assert len(calls) == 1
+    finally:
+        state.watcher.stop()
+
+
+def test_watcher_retries_a_change_it_could_not_handle(tmp_path):
+    artifact = tmp_path / "serving_bundle.npz"
+    artifact.write_bytes(b"v1")
+    answers = [False, True]
+    calls = []
+
+    def on_change() -> bool:
+        calls.append(answers[len(calls)] if len(calls) < len(answers) else True)
+        return calls[-1]
+
+    watcher = ModelWatcher(lambda: [artifact], on_change, interval_seconds=0.01)
+    watcher.start()
+    try:
+        artifact.write_bytes(b"v2")
+        assert _wait_for(lambda: len(calls) == 2)
+        time.sleep(0.1)
+        assert calls == [False, True]
+    finally:
+        watcher.stop()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import itertools
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from ml import config
+from ml.target_calculator import TargetCalculator
+
+
+def _scalar_targets(median_income: float, density: float, transit: float, business_type: str, scale: str) -> dict:
+    """The per-row heuristics written out with plain floats, as the calculator computed them row by row."""
+    info = config.BUSINESS_TYPE_INFO[business_type]
+    jobs = max(info["base_jobs"] * config.SCALE_FACTORS.get(scale, 1.0), 1.0)
+    base_wages = jobs * median_income * config.WAGE_INCOME_RATIO * (median_income / config.NATIONAL_MEDIAN_INCOME)
+    transit_factor = 1 + (transit / config.TRANSIT_SCORE_SCALE)
+    baseline = 60.0 if density < 1500 else 120.0
+    foot_traffic = max((density * info["foot_traffic_multiplier"] * transit_factor) / 2.5, baseline)
+    income_factor = 0.85 + 0.3 * (median_income / config.NATIONAL_MEDIAN_INCOME)
+    spending = max(foot_traffic * info["avg_spend"] * income_factor, 1.0)
+    wages = min(max(base_wages, spending * 0.3), spending * 0.58)
+    return {
+        "wages": wages,
+        "foot_traffic": foot_traffic,
+        "local_spending": spending,
+        "sales_tax": spending * config.NY_SALES_TAX_RATE,
+    }
+
+
+def test_calculate_batch_matches_scalar_heuristics():
+    # Densities either side of the baseline switch and incomes that hit both payroll clamps.
+    rows = list(
+        itertools.product(
+            [18_000.0, 54_000.0, 140_000.0],
+            [0.0, 1_499.0, 1_500.0, 9_000.0],
+            [0.0, 45.0, config.TRANSIT_SCORE_SCALE],
+            list(config.BUSINESS_TYPE_INFO),
+            list(config.SCALE_FACTORS),
+        )
+    )
+    batch = TargetCalculator.calculate_batch(*(list(column) for column in zip(*rows)))
+    for idx, row in enumerate(rows):
+        expected = _scalar_targets(*row)
+        for name, value in expected.items():
+            assert batch[name][idx] == pytest.approx(value, rel=1e-12), (name, row)
+
+
+def test_calculate_is_one_row_of_the_batch():
+    metrics = SimpleNamespace(median_income=61_000.0, population_density=2_400.0, transit_score=30.0)
+    repository = SimpleNamespace(get_metrics=lambda location_key: metrics)
+
+    single = TargetCalculator.calculate("anywhere", "restaurant", "large", repository)
+    expected = _scalar_targets(61_000.0, 2_400.0, 30.0, "restaurant", "large")
+    assert single == pytest.approx(expected, rel=1e-12)
+    assert all(isinstance(value, float) for value in single.values())
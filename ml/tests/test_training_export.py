@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from ml.feature_engineering import TRAINING_LABEL_COLUMNS, FeatureEngineer, LocationFeatureRepository
+from ml.training_export import EXPORT_FORMATS, export_training_chunks, iter_training_data, read_training_data
+
+
+@pytest.fixture(scope="module")
+def engineer(dataset_loader, tmp_path_factory):
+    cache_path = tmp_path_factory.mktemp("metrics") / "location_metrics.json"
+    return FeatureEngineer(LocationFeatureRepository(dataset_loader, cache_path=cache_path))
+
+
+def _assert_same_rows(actual: pd.DataFrame, expected: pd.DataFrame, export_format: str) -> None:
+    if export_format == "columnar":
+        pd.testing.assert_frame_equal(actual, expected)
+        return
+    # JSON lines carries labels as plain strings and floats to 15 significant digits.
+    expected = expected.astype({column: object for column in TRAINING_LABEL_COLUMNS if column in expected})
+    pd.testing.assert_frame_equal(actual, expected, check_exact=False, rtol=1e-14)
+
+
+def test_chunks_concatenate_to_the_training_frame(engineer):
+    chunks = list(engineer.iter_training_chunks(chunk_rows=100))
+    assert len(chunks) > 1
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), engineer.generate_training_frame())
+
+
+@pytest.mark.parametrize("export_format", EXPORT_FORMATS)
+def test_export_round_trip(engineer, tmp_path, export_format):
+    expected = engineer.generate_training_frame()
+    path = tmp_path / "training_data"
+    rows = export_training_chunks(engineer.iter_training_chunks(chunk_rows=100), path, export_format)
+    assert rows == len(expected)
+
+    _assert_same_rows(read_training_data(path), expected, export_format)
+    streamed = pd.concat(iter_training_data(path, chunk_rows=70), ignore_index=True)
+    _assert_same_rows(streamed, expected, export_format)
+    subset = ["local_spending", "business_type"]
+    _assert_same_rows(read_training_data(path, columns=subset), expected[subset], export_format)
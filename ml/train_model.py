@@ -1,18 +1,44 @@
 from __future__ import annotations
 
 import argparse
+from pathlib import Path
 
-from ml.model_trainer import ModelTrainer
+from ml.model_trainer import FOREST_MODES, ModelTrainer
+from ml.training_export import EXPORT_FORMATS
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Train business impact RandomForest model")
     parser.add_argument("--output", type=str, default=None, help="Optional output directory")
+    parser.add_argument(
+        "--forest-mode",
+        choices=FOREST_MODES,
+        default="per_target",
+        help="One forest per target (per_target) or a single multi-output forest (joint)",
+    )
+    parser.add_argument(
+        "--compare-forest-modes",
+        action="store_true",
+        help="Also fit the other forest mode and record both in model_metadata.json",
+    )
+    parser.add_argument(
+        "--dataset-format",
+        choices=EXPORT_FORMATS,
+        default="columnar",
+        help="Training data export: columnar directory or JSON lines",
+    )
     args = parser.parse_args()
 
-    trainer = ModelTrainer(output_dir=args.output)
+    trainer = ModelTrainer(
+        output_dir=Path(args.output) if args.output else None,
+        forest_mode=args.forest_mode,
+        compare_forest_modes=args.compare_forest_modes,
+        dataset_format=args.dataset_format,
+    )
     artifacts = trainer.run()
     print("Model saved to", artifacts.model_path)
+    print("Compiled forest saved to", artifacts.compiled_model_path)
+    print("Serving bundle saved to", artifacts.serving_bundle_path)
     print("Feature columns saved to", artifacts.feature_columns_path)
     print("Metadata saved to", artifacts.metadata_path)
     print("Training dataset exported to", artifacts.dataset_export_path)
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+EXPORT_FORMATS = ("columnar", "jsonl")
+EXPORT_FORMAT_VERSION = 1
+MANIFEST_FILENAME = "manifest.json"
+READ_CHUNK_ROWS = 65536
+
+# Column name -> (memory-mapped values, category table for categorical columns).
+MappedColumns = Dict[str, Tuple[np.ndarray, Optional[List[str]]]]
+
+
+class TrainingDataWriter:
+    """Appends training-frame chunks to disk as they are produced.
+
+    ``columnar`` writes a directory with one raw little-endian binary file
+    per column plus ``manifest.json`` (dtypes, row count, category tables);
+    categoricals are stored as int32 codes. ``jsonl`` writes one JSON record
+    per line. Output goes to a staging path and replaces ``path`` only on a
+    clean :meth:`close`, so readers never see a half-written export.
+    """
+
+    def __init__(self, path: Path, export_format: str = "columnar"):
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {export_format}")
+        self.path = Path(path)
+        self.export_format = export_format
+        self.rows = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._staging = Path(tempfile.mkdtemp(dir=self.path.parent, prefix=f".{self.path.name}.staging-"))
+        self._columns: List[str] | None = None
+        self._dtypes: Dict[str, str] = {}
+        self._categories: Dict[str, List[str]] = {}
+        self._handles: Dict[str, object] = {}
+
+    def __enter__(self) -> "TrainingDataWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        if self._columns is None:
+            self._columns = list(chunk.columns)
+        elif list(chunk.columns) != self._columns:
+            raise ValueError("All chunks must have the same columns in the same order")
+        if self.export_format == "jsonl":
+            handle = self._handle("data.jsonl", "w")
+            # pandas terminates each lines=True chunk with a newline, so chunks concatenate cleanly.
+            chunk.to_json(handle, orient="records", lines=True, double_precision=15)
+        else:
+            for name in self._columns:
+                self._encode_column(name, chunk[name]).tofile(self._handle(f"{name}.bin", "wb"))
+        self.rows += len(chunk)
+
+    def close(self) -> None:
+        for handle in self._handles.values():
+            handle.close()
+        self._handles.clear()
+        if self.export_format == "columnar":
+            manifest = {
+                "version": EXPORT_FORMAT_VERSION,
+                "rows": self.rows,
+                "columns": [
+                    {"name": name, "dtype": self._dtypes[name], "categories": self._categories.get(name)}
+                    for name in self._columns or []
+                ],
+            }
+            with (self._staging / MANIFEST_FILENAME).open("w", encoding="utf-8") as fh:
+                json.dump(manifest, fh, indent=2)
+            self._replace(self._staging)
+        else:
+            data_path = self._staging / "data.jsonl"
+            data_path.touch()
+            self._replace(data_path)
+        shutil.rmtree(self._staging, ignore_errors=True)
+
+    def abort(self) -> None:
+        for handle in self._handles.values():
+            handle.close()
+        self._handles.clear()
+        shutil.rmtree(self._staging, ignore_errors=True)
+
+    def _handle(self, filename: str, mode: str):
+        if filename not in self._handles:
+            encoding = None if "b" in mode else "utf-8"
+            self._handles[filename] = (self._staging / filename).open(mode, encoding=encoding)
+        return self._handles[filename]
+
+    def _encode_column(self, name: str, series: pd.Series) -> np.ndarray:
+        if isinstance(series.dtype, pd.CategoricalDtype) or not pd.api.types.is_numeric_dtype(series):
+            known = self._categories.setdefault(name, [])
+            values = series.astype(object)
+            # Chunks may introduce labels unseen so far; extend the shared table in first-seen order.
+            seen = set(known)
+            known.extend(label for label in pd.unique(values) if label not in seen)
+            self._dtypes[name] = "<i4"
+            return pd.Categorical(values, categories=known).codes.astype("<i4")
+        dtype = self._dtypes.setdefault(name, series.dtype.newbyteorder("<").str)
+        return series.to_numpy().astype(dtype, copy=False)
+
+    def _replace(self, source: Path) -> None:
+        # A directory cannot be renamed over a non-empty one; move the old export aside first.
+        retired = None
+        if self.path.is_dir():
+            retired = self.path.with_name(f".{self.path.name}.old-{os.getpid()}")
+            os.replace(self.path, retired)
+        os.replace(source, self.path)
+        if retired is not None:
+            shutil.rmtree(retired, ignore_errors=True)
+
+
+def read_training_data(path: Path, columns: Sequence[str] | None = None) -> pd.DataFrame:
+    """Load a whole export, optionally restricted to ``columns``."""
+    path = Path(path)
+    if not path.is_dir():
+        frame = pd.read_json(path, orient="records", lines=True)
+        return frame if columns is None else frame[list(columns)]
+    mapped, rows = _map_columns(path, columns)
+    return _columns_frame(mapped, 0, rows)
+
+
+def iter_training_data(
+    path: Path, chunk_rows: int = READ_CHUNK_ROWS, columns: Sequence[str] | None = None
+) -> Iterator[pd.DataFrame]:
+    """Read an export back ``chunk_rows`` rows at a time without loading the rest."""
+    path = Path(path)
+    if not path.is_dir():
+        for chunk in pd.read_json(path, orient="records", lines=True, chunksize=chunk_rows):
+            yield chunk if columns is None else chunk[list(columns)]
+        return
+    mapped, rows = _map_columns(path, columns)
+    for start in range(0, rows, chunk_rows):
+        yield _columns_frame(mapped, start, min(start + chunk_rows, rows))
+
+
+def export_training_chunks(chunks: Iterable[pd.DataFrame], path: Path, export_format: str = "columnar") -> int:
+    """Stream ``chunks`` (e.g. ``FeatureEngineer.iter_training_chunks``) to ``path``; returns the row count."""
+    with TrainingDataWriter(path, export_format) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    return writer.rows
+
+
+def _read_manifest(path: Path) -> Dict:
+    with (path / MANIFEST_FILENAME).open("r", encoding="utf-8") as fh:
+        manifest = json.load(fh)
+    if manifest.get("version") != EXPORT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported training export version in {path}: {manifest.get('version')}")
+    return manifest
+
+
+def _map_columns(path: Path, columns: Sequence[str] | None) -> Tuple[MappedColumns, int]:
+    """Memory-map the requested columns of a columnar export."""
+    manifest = _read_manifest(path)
+    rows = manifest["rows"]
+    mapped: MappedColumns = {}
+    for column in manifest["columns"]:
+        name = column["name"]
+        if columns is not None and name not in columns:
+            continue
+        if rows:
+            values = np.memmap(path / f"{name}.bin", dtype=column["dtype"], mode="r", shape=(rows,)).view(np.ndarray)
+        else:
+            values = np.empty(0, dtype=column["dtype"])
+        mapped[name] = (values, column["categories"])
+    return mapped, rows
+
+
+def _columns_frame(mapped: MappedColumns, start: int, stop: int) -> pd.DataFrame:
+    data: Dict[str, object] = {}
+    for name, (values, categories) in mapped.items():
+        window = values[start:stop]
+        data[name] = window if categories is None else pd.Categorical.from_codes(window, categories=categories)
+    return pd.DataFrame(data, index=pd.RangeIndex(start, stop))
@@ -2,7 +2,10 @@ from __future__ import annotations
 
 import math
 from dataclasses import asdict
-from typing import Dict
+from decimal import Decimal
+from typing import Dict, Sequence
+
+import numpy as np
 
 from ml.config import BoundingBox
 
@@ -21,10 +24,39 @@ def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     return EARTH_RADIUS_KM * c
 
 
+def haversine_km_array(lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """Vectorized :func:`haversine_km` over arrays of endpoints."""
+    lat1_rad = np.radians(lat1)
+    lat2_rad = np.radians(lat2)
+    delta_lat = lat2_rad - lat1_rad
+    delta_lon = np.radians(lon2 - lon1)
+    a = np.sin(delta_lat / 2) ** 2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(delta_lon / 2) ** 2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return EARTH_RADIUS_KM * c
+
+
 def point_in_bbox(lat: float, lon: float, bbox: BoundingBox) -> bool:
     return bbox.min_lat <= lat <= bbox.max_lat and bbox.min_lon <= lon <= bbox.max_lon
 
 
+def radius_bbox(lat: float, lon: float, radius_km: float) -> BoundingBox:
+    """Smallest lat/lon box containing the circle of ``radius_km`` around a point."""
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    lon_delta = lat_delta / max(math.cos(math.radians(lat)), 1e-6)
+    return BoundingBox(lat - lat_delta, lat + lat_delta, lon - lon_delta, lon + lon_delta)
+
+
+def bbox_overlap_area_km2(first: BoundingBox, second: BoundingBox) -> float:
+    """Area of the intersection of two boxes, or 0.0 when they do not overlap."""
+    min_lat = max(first.min_lat, second.min_lat)
+    max_lat = min(first.max_lat, second.max_lat)
+    min_lon = max(first.min_lon, second.min_lon)
+    max_lon = min(first.max_lon, second.max_lon)
+    if min_lat >= max_lat or min_lon >= max_lon:
+        return 0.0
+    return bbox_area_km2(BoundingBox(min_lat, max_lat, min_lon, max_lon))
+
+
 def bbox_area_km2(bbox: BoundingBox) -> float:
     lat_span = bbox.max_lat - bbox.min_lat
     lon_span = bbox.max_lon - bbox.min_lon
@@ -47,5 +79,33 @@ def segment_intersects_bbox(p1: Dict[str, float], p2: Dict[str, float], bbox: Bo
     return overlaps_lat and overlaps_lon
 
 
+def bbox_bounds_array(bboxes: Sequence[BoundingBox]) -> np.ndarray:
+    """Stack bounding boxes into a (n, 4) array of min_lat, max_lat, min_lon, max_lon."""
+    return np.array(
+        [[bbox.min_lat, bbox.max_lat, bbox.min_lon, bbox.max_lon] for bbox in bboxes],
+        dtype=np.float64,
+    ).reshape(-1, 4)
+
+
+def decimal_tie_bounds(bounds: np.ndarray) -> np.ndarray:
+    """Nudge bbox bounds so float comparisons match exact decimal ones.
+
+    Overpass coordinates streamed as ``Decimal`` compare exactly against the
+    float bounds, so a coordinate with the same literal as a bound lands on
+    whichever side the bound's binary rounding puts it. Shifting the bound by
+    one ulp in that direction reproduces the decision for float coordinates.
+    """
+    adjusted = bounds.copy()
+    for row in range(bounds.shape[0]):
+        for col in range(4):
+            value = float(bounds[row, col])
+            literal, exact = Decimal(repr(value)), Decimal(value)
+            if col % 2 == 0 and literal < exact:
+                adjusted[row, col] = np.nextafter(value, np.inf)
+            elif col % 2 == 1 and literal > exact:
+                adjusted[row, col] = np.nextafter(value, -np.inf)
+    return adjusted
+
+
 def bbox_to_dict(bbox: BoundingBox) -> Dict[str, float]:
     return asdict(bbox)
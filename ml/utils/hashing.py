@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Iterable
+
+_CHUNK_SIZE = 1 << 20
+
+
+def file_fingerprint(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as fh:
+        for chunk in iter(lambda: fh.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def combined_fingerprint(paths: Iterable[Path]) -> str:
+    """Fingerprint an ordered group of files by name and contents."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(Path(path).name.encode("utf-8"))
+        digest.update(file_fingerprint(path).encode("ascii"))
+    return digest.hexdigest()
+
+
+def json_fingerprint(payload: Any) -> str:
+    """Fingerprint a JSON-serialisable value independent of key order."""
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import os
+import struct
+import zipfile
+from pathlib import Path
+from typing import Dict, Mapping
+
+import numpy as np
+
+_LOCAL_HEADER_SIZE = 30
+
+
+def save_npz_atomic(path: Path, arrays: Mapping[str, np.ndarray]) -> None:
+    """Write an uncompressed ``.npz`` via a temp file and rename.
+
+    Readers that memory-mapped the previous file keep a valid mapping of the
+    old inode instead of seeing it truncated underneath them.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp_path.open("wb") as fh:
+            np.savez(fh, **arrays)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def load_npz(path: Path, mmap: bool = False) -> Dict[str, np.ndarray]:
+    """Load every array of an ``.npz``; with ``mmap`` arrays are mapped in place.
+
+    ``np.load`` cannot memory-map archive members, but ``np.savez`` stores
+    them uncompressed, so each member's data is a plain byte range of the
+    file. Mapping that range read-only lets every process serving the same
+    file share one copy through the page cache. Scalars and empty arrays are
+    read normally.
+    """
+    if not mmap:
+        with np.load(path, allow_pickle=False) as payload:
+            return {name: payload[name] for name in payload.files}
+
+    arrays: Dict[str, np.ndarray] = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as fh:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"Cannot memory-map compressed member {info.filename} of {path}")
+            fh.seek(info.header_offset)
+            name_length, extra_length = struct.unpack("<HH", fh.read(_LOCAL_HEADER_SIZE)[26:30])
+            fh.seek(info.header_offset + _LOCAL_HEADER_SIZE + name_length + extra_length)
+            version = np.lib.format.read_magic(fh)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(fh)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(fh)
+            name = info.filename[: -len(".npy")] if info.filename.endswith(".npy") else info.filename
+            if dtype.hasobject:
+                raise ValueError(f"Refusing to load object array {name} from {path}")
+            if not shape or not np.prod(shape):
+                fh.seek(info.header_offset + _LOCAL_HEADER_SIZE + name_length + extra_length)
+                arrays[name] = np.lib.format.read_array(fh, allow_pickle=False)
+                continue
+            mapped = np.memmap(
+                path,
+                dtype=dtype,
+                mode="r",
+                offset=fh.tell(),
+                shape=shape,
+                order="F" if fortran_order else "C",
+            )
+            arrays[name] = mapped.view(np.ndarray)
+    return arrays
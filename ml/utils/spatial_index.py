@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+from ml.config import BoundingBox
+from ml.utils.geo import haversine_km_array, radius_bbox
+
+DEFAULT_CELL_SIZE_DEG = 0.01
+
+
+def _cell_range(values: np.ndarray, origin: float, cell_size: float) -> np.ndarray:
+    return np.floor((values - origin) / cell_size).astype(np.int64)
+
+
+class PointGrid:
+    """Uniform lat/lon grid over a point set for inclusive bbox queries.
+
+    Points are sorted by cell id (row-major, latitude rows) so that each row of
+    cells a query touches maps to one contiguous slice of the sorted order.
+    """
+
+    def __init__(self, lat: np.ndarray, lon: np.ndarray, cell_size: float = DEFAULT_CELL_SIZE_DEG):
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        self.cell_size = cell_size
+        if self.lat.size == 0:
+            self.origin = (0.0, 0.0)
+            self.shape = (0, 0)
+            self._order = np.empty(0, dtype=np.int64)
+            self._cell_starts = np.zeros(1, dtype=np.int64)
+            return
+        self.origin = (float(self.lat.min()), float(self.lon.min()))
+        rows = _cell_range(self.lat, self.origin[0], cell_size)
+        cols = _cell_range(self.lon, self.origin[1], cell_size)
+        self.shape = (int(rows.max()) + 1, int(cols.max()) + 1)
+        cell_ids = rows * self.shape[1] + cols
+        self._order = np.argsort(cell_ids, kind="stable")
+        counts = np.bincount(cell_ids, minlength=self.shape[0] * self.shape[1])
+        self._cell_starts = np.concatenate(([0], np.cumsum(counts)))
+
+    @classmethod
+    def from_frame(cls, frame, lat_column: str = "lat", lon_column: str = "lon", **kwargs) -> "PointGrid":
+        if frame.empty:
+            return cls(np.empty(0), np.empty(0), **kwargs)
+        return cls(frame[lat_column].to_numpy(), frame[lon_column].to_numpy(), **kwargs)
+
+    def __len__(self) -> int:
+        return int(self.lat.size)
+
+    def query_bbox(self, bbox: BoundingBox) -> np.ndarray:
+        """Return sorted positional indices of points inside ``bbox`` (bounds inclusive)."""
+        if not len(self):
+            return np.empty(0, dtype=np.int64)
+        n_rows, n_cols = self.shape
+        row_lo = max(int(_cell_range(np.float64(bbox.min_lat), self.origin[0], self.cell_size)), 0)
+        row_hi = min(int(_cell_range(np.float64(bbox.max_lat), self.origin[0], self.cell_size)), n_rows - 1)
+        col_lo = max(int(_cell_range(np.float64(bbox.min_lon), self.origin[1], self.cell_size)), 0)
+        col_hi = min(int(_cell_range(np.float64(bbox.max_lon), self.origin[1], self.cell_size)), n_cols - 1)
+        if row_lo > row_hi or col_lo > col_hi:
+            return np.empty(0, dtype=np.int64)
+        slices = [
+            self._order[self._cell_starts[row * n_cols + col_lo] : self._cell_starts[row * n_cols + col_hi + 1]]
+            for row in range(row_lo, row_hi + 1)
+        ]
+        candidates = np.concatenate(slices)
+        lat = self.lat[candidates]
+        lon = self.lon[candidates]
+        inside = (
+            (lat >= bbox.min_lat) & (lat <= bbox.max_lat) & (lon >= bbox.min_lon) & (lon <= bbox.max_lon)
+        )
+        return np.sort(candidates[inside])
+
+    def count_bbox(self, bbox: BoundingBox) -> int:
+        return int(self.query_bbox(bbox).size)
+
+    def query_radius(self, lat: float, lon: float, radius_km: float) -> np.ndarray:
+        """Return sorted positional indices of points within ``radius_km`` of (lat, lon)."""
+        bbox = radius_bbox(lat, lon, radius_km)
+        candidates = self.query_bbox(bbox)
+        if not candidates.size:
+            return candidates
+        distances = haversine_km_array(
+            np.full(candidates.size, lat), np.full(candidates.size, lon), self.lat[candidates], self.lon[candidates]
+        )
+        return candidates[distances <= radius_km]
+
+
+class BoxGrid:
+    """Uniform grid over a set of bounding boxes for batched overlap queries.
+
+    ``bounds`` is an (n, 4) array of min_lat, max_lat, min_lon, max_lon as
+    produced by :func:`ml.utils.geo.bbox_bounds_array`.
+    """
+
+    def __init__(self, bounds: np.ndarray, cell_size: float = DEFAULT_CELL_SIZE_DEG):
+        self.bounds = np.asarray(bounds, dtype=np.float64).reshape(-1, 4)
+        self.cell_size = cell_size
+        if not self.bounds.shape[0]:
+            self.origin = (0.0, 0.0)
+            self.shape = (0, 0)
+            self._box_ids = np.empty(0, dtype=np.int64)
+            self._cell_starts = np.zeros(1, dtype=np.int64)
+            return
+        self.origin = (float(self.bounds[:, 0].min()), float(self.bounds[:, 2].min()))
+        row_lo, row_hi, col_lo, col_hi = self._cell_spans(
+            self.bounds[:, 0], self.bounds[:, 1], self.bounds[:, 2], self.bounds[:, 3]
+        )
+        self.shape = (int(row_hi.max()) + 1, int(col_hi.max()) + 1)
+        owners, cell_ids = self._expand_cells(row_lo, row_hi, col_lo, col_hi)
+        order = np.argsort(cell_ids, kind="stable")
+        self._box_ids = owners[order]
+        counts = np.bincount(cell_ids, minlength=self.shape[0] * self.shape[1])
+        self._cell_starts = np.concatenate(([0], np.cumsum(counts)))
+
+    def __len__(self) -> int:
+        return int(self.bounds.shape[0])
+
+    def _cell_spans(self, min_lat, max_lat, min_lon, max_lon) -> Tuple[np.ndarray, ...]:
+        return (
+            _cell_range(min_lat, self.origin[0], self.cell_size),
+            _cell_range(max_lat, self.origin[0], self.cell_size),
+            _cell_range(min_lon, self.origin[1], self.cell_size),
+            _cell_range(max_lon, self.origin[1], self.cell_size),
+        )
+
+    def _expand_cells(self, row_lo, row_hi, col_lo, col_hi) -> Tuple[np.ndarray, np.ndarray]:
+        """Enumerate (owner, cell id) pairs for every cell each span covers."""
+        n_rows = row_hi - row_lo + 1
+        n_cols = col_hi - col_lo + 1
+        counts = n_rows * n_cols
+        owners = np.repeat(np.arange(counts.size), counts)
+        offsets = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+        rows = row_lo[owners] + offsets // n_cols[owners]
+        cols = col_lo[owners] + offsets % n_cols[owners]
+        return owners, rows * self.shape[1] + cols
+
+    def segment_pairs(
+        self, lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (segment index, box index) pairs whose extents overlap."""
+        empty = np.empty(0, dtype=np.int64)
+        if not len(self) or not np.size(lat1):
+            return empty, empty
+        min_lat = np.minimum(lat1, lat2)
+        max_lat = np.maximum(lat1, lat2)
+        min_lon = np.minimum(lon1, lon2)
+        max_lon = np.maximum(lon1, lon2)
+        n_rows, n_cols = self.shape
+        row_lo, row_hi, col_lo, col_hi = self._cell_spans(min_lat, max_lat, min_lon, max_lon)
+        in_grid = (row_hi >= 0) & (row_lo < n_rows) & (col_hi >= 0) & (col_lo < n_cols)
+        segments = np.flatnonzero(in_grid)
+        if not segments.size:
+            return empty, empty
+        seg_owner, cell_ids = self._expand_cells(
+            np.clip(row_lo[segments], 0, n_rows - 1),
+            np.clip(row_hi[segments], 0, n_rows - 1),
+            np.clip(col_lo[segments], 0, n_cols - 1),
+            np.clip(col_hi[segments], 0, n_cols - 1),
+        )
+        starts = self._cell_starts[cell_ids]
+        counts = self._cell_starts[cell_ids + 1] - starts
+        pair_segments = np.repeat(segments[seg_owner], counts)
+        offsets = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+        pair_boxes = self._box_ids[np.repeat(starts, counts) + offsets]
+
+        # A segment spanning several cells can meet the same box more than once.
+        keys = np.unique(pair_segments * len(self) + pair_boxes)
+        pair_segments, pair_boxes = keys // len(self), keys % len(self)
+
+        bounds = self.bounds[pair_boxes]
+        overlaps = ~(
+            (max_lat[pair_segments] < bounds[:, 0])
+            | (min_lat[pair_segments] > bounds[:, 1])
+            | (max_lon[pair_segments] < bounds[:, 2])
+            | (min_lon[pair_segments] > bounds[:, 3])
+        )
+        return pair_segments[overlaps], pair_boxes[overlaps]